@@ -337,7 +337,9 @@ def render_campaigns_table(campaigns_df: pd.DataFrame):
         # Cor do status
         status_color = '#48bb78' if status == 'completed' else '#ecc94b' if status == 'active' else '#718096'
 
-        with st.container():
+        # Borda do próprio container no lugar do st.divider() por
+        # campanha: um elemento a menos por card no rerun
+        with st.container(border=True):
             cols = st.columns([3, 1.5, 1.5, 1.5, 1.5])
 
             with cols[0]:
@@ -356,8 +358,6 @@ def render_campaigns_table(campaigns_df: pd.DataFrame):
             with cols[4]:
                 st.metric("Taxa", f"{taxa:.0f}%")
 
-            st.divider()
-
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # PLOTLY CHARTS
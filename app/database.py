@@ -5,7 +5,7 @@ Mantém a mesma interface pública da versão anterior (Google Sheets),
 substituindo apenas o backend por psycopg2.
 """
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
 from contextlib import contextmanager
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
@@ -13,6 +13,12 @@ import json
 import uuid
 import os
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -34,7 +40,15 @@ def get_connection():
     """Retorna conexão reutilizável (reconecta se necessário)"""
     global _connection
     if _connection is None or _connection.closed:
-        _connection = psycopg2.connect(DATABASE_URL)
+        # Keepalives TCP evitam que o Neon derrube a conexão ociosa entre
+        # reruns (reconectar paga handshake TLS + search_path de novo)
+        _connection = psycopg2.connect(
+            DATABASE_URL,
+            keepalives=1,
+            keepalives_idle=30,
+            keepalives_interval=10,
+            keepalives_count=3,
+        )
         _connection.autocommit = True
         with _connection.cursor() as cur:
             cur.execute("SET search_path TO sdr")
@@ -69,6 +83,13 @@ def _now_iso() -> str:
     return datetime.now().isoformat()
 
 
+def _json_dumps(obj) -> str:
+    """Serializa para JSON usando orjson (C) quando disponível"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj, ensure_ascii=False)
+
+
 def _row_to_dict(row) -> Dict:
     """Converte RealDictRow para dict normal com timestamps como string"""
     if row is None:
@@ -94,6 +115,33 @@ def init_database():
     try:
         with get_cursor() as cur:
             cur.execute("SELECT 1")
+            # Índice para a detecção de duplicatas (lookup por email + data)
+            cur.execute("""
+                CREATE INDEX IF NOT EXISTS idx_email_log_email_sent
+                ON email_log (LOWER(email_to), sent_at)
+            """)
+            # Índice usado por get_email_log_by_campaign
+            cur.execute("""
+                CREATE INDEX IF NOT EXISTS idx_email_log_campaign
+                ON email_log (campaign_id)
+            """)
+            # Fila de envio persistente (sobrevive a restart do processo)
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS scheduled_emails (
+                    id TEXT PRIMARY KEY,
+                    campaign_id TEXT NOT NULL,
+                    lead_id TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt_at TIMESTAMP NOT NULL DEFAULT NOW(),
+                    sent_at TIMESTAMP,
+                    created_at TIMESTAMP NOT NULL DEFAULT NOW()
+                )
+            """)
+            cur.execute("""
+                CREATE INDEX IF NOT EXISTS idx_scheduled_status_next
+                ON scheduled_emails (status, next_attempt_at)
+            """)
     except Exception as e:
         print(f"[WARN] Erro ao conectar ao banco: {e}")
 
@@ -160,9 +208,31 @@ def get_campaign(campaign_id: str) -> Optional[Dict]:
 
 # === Lead Functions ===
 
-def insert_lead(campaign_id: str, lead_data: Dict) -> str:
-    """Insere um lead e retorna o ID"""
-    lead_id = _generate_id()
+# Colunas e template de linha compartilhados entre o INSERT unitário e
+# o lote via execute_values (que exige "VALUES %s" + template por linha)
+_LEAD_INSERT_COLS = """
+        id, campaign_id, status, nome_clinica, endereco, cidade_uf, cnpj, site,
+        decisor_nome, decisor_cargo, decisor_linkedin, email_principal, email_tipo,
+        telefone, whatsapp, instagram, fonte, confianca, score,
+        resumo_clinica, perfil_decisor, gancho_personalizacao, dor_provavel, tom_sugerido,
+        notas, motivo_descarte, raw_data, created_at, updated_at
+"""
+
+_LEAD_INSERT_ROW = """(
+        %s, %s, 'new', %s, %s, %s, %s, %s,
+        %s, %s, %s, %s, %s,
+        %s, %s, %s, %s, %s, %s,
+        %s, %s, %s, %s, %s,
+        '', '', %s, NOW(), NOW()
+    )"""
+
+_LEAD_INSERT_SQL = f"INSERT INTO leads ({_LEAD_INSERT_COLS}) VALUES {_LEAD_INSERT_ROW}"
+
+_LEAD_INSERT_VALUES_SQL = f"INSERT INTO leads ({_LEAD_INSERT_COLS}) VALUES %s"
+
+
+def _lead_insert_params(lead_id: str, campaign_id: str, lead_data: Dict) -> tuple:
+    """Monta a tupla de parâmetros de INSERT para um lead"""
     contexto = lead_data.get('contexto_abordagem', {})
 
     # Score com validação 0-100
@@ -177,50 +247,65 @@ def insert_lead(campaign_id: str, lead_data: Dict) -> str:
     if confianca not in ('', 'alta', 'media', 'baixa'):
         confianca = ''
 
+    return (
+        lead_id,
+        campaign_id,
+        lead_data.get('nome_clinica', ''),
+        lead_data.get('endereco', ''),
+        lead_data.get('cidade_uf', ''),
+        lead_data.get('cnpj', ''),
+        lead_data.get('site', ''),
+        lead_data.get('decisor', {}).get('nome', ''),
+        lead_data.get('decisor', {}).get('cargo', ''),
+        lead_data.get('decisor', {}).get('linkedin', ''),
+        lead_data.get('contatos', {}).get('email_principal', ''),
+        lead_data.get('contatos', {}).get('email_tipo', ''),
+        lead_data.get('contatos', {}).get('telefone', ''),
+        lead_data.get('contatos', {}).get('whatsapp', ''),
+        lead_data.get('contatos', {}).get('instagram', ''),
+        lead_data.get('fonte', ''),
+        confianca,
+        score,
+        contexto.get('resumo_clinica', ''),
+        contexto.get('perfil_decisor', ''),
+        contexto.get('gancho_personalizacao', ''),
+        contexto.get('dor_provavel', ''),
+        contexto.get('tom_sugerido', ''),
+        _json_dumps(lead_data),
+    )
+
+
+def insert_lead(campaign_id: str, lead_data: Dict) -> str:
+    """Insere um lead e retorna o ID"""
+    lead_id = _generate_id()
     with get_cursor() as cur:
-        cur.execute("""
-            INSERT INTO leads (
-                id, campaign_id, status, nome_clinica, endereco, cidade_uf, cnpj, site,
-                decisor_nome, decisor_cargo, decisor_linkedin, email_principal, email_tipo,
-                telefone, whatsapp, instagram, fonte, confianca, score,
-                resumo_clinica, perfil_decisor, gancho_personalizacao, dor_provavel, tom_sugerido,
-                notas, motivo_descarte, raw_data, created_at, updated_at
-            ) VALUES (
-                %s, %s, 'new', %s, %s, %s, %s, %s,
-                %s, %s, %s, %s, %s,
-                %s, %s, %s, %s, %s, %s,
-                %s, %s, %s, %s, %s,
-                '', '', %s, NOW(), NOW()
-            )
-        """, (
-            lead_id,
-            campaign_id,
-            lead_data.get('nome_clinica', ''),
-            lead_data.get('endereco', ''),
-            lead_data.get('cidade_uf', ''),
-            lead_data.get('cnpj', ''),
-            lead_data.get('site', ''),
-            lead_data.get('decisor', {}).get('nome', ''),
-            lead_data.get('decisor', {}).get('cargo', ''),
-            lead_data.get('decisor', {}).get('linkedin', ''),
-            lead_data.get('contatos', {}).get('email_principal', ''),
-            lead_data.get('contatos', {}).get('email_tipo', ''),
-            lead_data.get('contatos', {}).get('telefone', ''),
-            lead_data.get('contatos', {}).get('whatsapp', ''),
-            lead_data.get('contatos', {}).get('instagram', ''),
-            lead_data.get('fonte', ''),
-            confianca,
-            score,
-            contexto.get('resumo_clinica', ''),
-            contexto.get('perfil_decisor', ''),
-            contexto.get('gancho_personalizacao', ''),
-            contexto.get('dor_provavel', ''),
-            contexto.get('tom_sugerido', ''),
-            json.dumps(lead_data),
-        ))
+        cur.execute(_LEAD_INSERT_SQL, _lead_insert_params(lead_id, campaign_id, lead_data))
     return lead_id
 
 
+def insert_leads_bulk(campaign_id: str, leads: List[Dict]) -> List[str]:
+    """
+    Insere vários leads em lotes via execute_values.
+
+    Evita um round-trip + commit por lead ("Aprovar Todos" com centenas
+    de duplicatas): execute_values monta um INSERT multi-linha por
+    página de 500, em vez do statement por lead que o executemany
+    emitiria. Retorna os IDs na mesma ordem da lista de entrada.
+    """
+    if not leads:
+        return []
+
+    lead_ids = [_generate_id() for _ in leads]
+    params = [
+        _lead_insert_params(lead_id, campaign_id, lead)
+        for lead_id, lead in zip(lead_ids, leads)
+    ]
+    with get_cursor() as cur:
+        execute_values(cur, _LEAD_INSERT_VALUES_SQL, params,
+                       template=_LEAD_INSERT_ROW, page_size=500)
+    return lead_ids
+
+
 def update_lead_score(lead_id: str, score: int):
     """Atualiza o score de um lead"""
     try:
@@ -604,28 +689,67 @@ def get_email_history(email: str) -> List[Dict]:
         return [_row_to_dict(row) for row in cur.fetchall()]
 
 
-def check_leads_for_duplicates(leads: List[Dict], days: int = 180) -> tuple:
+def get_recent_sends_for_emails(emails: List[str], days: int = 180) -> Dict[str, Dict]:
     """
-    Verifica uma lista de leads para encontrar duplicatas recentes.
-    OTIMIZADO: Uma query SQL retorna todos os emails contatados recentemente.
+    Retorna o último envio bem-sucedido para cada email da lista.
+
+    Uma única query batched (em vez de um SELECT por lead), usando o
+    índice idx_email_log_email_sent. Retorna dict keyed por email
+    lowercase: {email: {last_sent_at, lead_id, campaign_id}}.
     """
-    leads_novos = []
-    leads_duplicados = []
+    if not emails:
+        return {}
 
     cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+    emails_lower = list({e.strip().lower() for e in emails if e})
 
-    # Carrega todos os emails enviados recentemente em uma query
     with get_cursor() as cur:
         cur.execute("""
             SELECT LOWER(email_to) as email, MAX(sent_at) as last_sent_at,
                    MAX(lead_id) as lead_id, MAX(campaign_id) as campaign_id
             FROM email_log
-            WHERE status = 'sent' AND sent_at >= %s
+            WHERE status = 'sent' AND sent_at >= %s AND LOWER(email_to) = ANY(%s)
             GROUP BY LOWER(email_to)
+        """, (cutoff, emails_lower))
+        return {row['email']: dict(row) for row in cur.fetchall()}
+
+
+def get_sent_emails_set(days: int = 180) -> set:
+    """
+    Retorna o conjunto de emails (lowercase) contatados com sucesso
+    nos últimos X dias. Usado como pré-filtro em memória: emails fora
+    do conjunto são comprovadamente novos e nem precisam da query
+    batched de duplicatas.
+
+    Erros de banco propagam de propósito: devolver set() vazio faria o
+    chamador (cacheado) tratar todo lead como novo e pular a checagem
+    de duplicatas silenciosamente.
+    """
+    cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+    with get_cursor() as cur:
+        cur.execute("""
+            SELECT DISTINCT LOWER(email_to) as email
+            FROM email_log
+            WHERE status = 'sent' AND sent_at >= %s
         """, (cutoff,))
-        recent_sends = {}
-        for row in cur.fetchall():
-            recent_sends[row['email']] = dict(row)
+        return {row['email'] for row in cur.fetchall()}
+
+
+def check_leads_for_duplicates(leads: List[Dict], days: int = 180) -> tuple:
+    """
+    Verifica uma lista de leads para encontrar duplicatas recentes.
+    OTIMIZADO: Uma query SQL batched só com os emails do lote.
+    """
+    leads_novos = []
+    leads_duplicados = []
+
+    batch_emails = [
+        lead.get('contatos', {}).get('email_principal') or lead.get('email_principal')
+        for lead in leads
+    ]
+    recent_sends = get_recent_sends_for_emails(
+        [e for e in batch_emails if e], days=days
+    )
 
     if not recent_sends:
         for lead in leads:
@@ -677,6 +801,114 @@ def check_leads_for_duplicates(leads: List[Dict], days: int = 180) -> tuple:
     return leads_novos, leads_duplicados
 
 
+# === Send Queue (fila persistente de envio) ===
+
+# Backoff exponencial por tentativa falhada (minutos)
+_RETRY_BACKOFF_MINUTES = [5, 15, 30]
+_MAX_SEND_ATTEMPTS = 3
+
+
+def enqueue_emails(campaign_id: str, lead_ids: List[str]):
+    """Agenda envio para uma lista de leads (um batch, status 'pending')"""
+    if not lead_ids:
+        return
+    try:
+        with get_cursor() as cur:
+            cur.executemany("""
+                INSERT INTO scheduled_emails (id, campaign_id, lead_id, status, next_attempt_at)
+                VALUES (%s, %s, %s, 'pending', NOW())
+            """, [(_generate_id(), campaign_id, lead_id) for lead_id in lead_ids])
+    except Exception:
+        pass
+
+
+def mark_scheduled_sent(campaign_id: str, lead_id: str):
+    """Marca o item da fila como enviado"""
+    try:
+        with get_cursor() as cur:
+            cur.execute("""
+                UPDATE scheduled_emails SET status = 'sent', sent_at = NOW()
+                WHERE campaign_id = %s AND lead_id = %s AND status IN ('pending', 'sending')
+            """, (campaign_id, lead_id))
+    except Exception:
+        pass
+
+
+def mark_scheduled_failed(campaign_id: str, lead_id: str):
+    """
+    Registra falha de envio com backoff exponencial (5 → 15 → 30 min).
+    Após esgotar as tentativas, o item vira 'failed' definitivo.
+    """
+    try:
+        with get_cursor() as cur:
+            cur.execute("""
+                SELECT id, attempts FROM scheduled_emails
+                WHERE campaign_id = %s AND lead_id = %s AND status IN ('pending', 'sending')
+                LIMIT 1
+            """, (campaign_id, lead_id))
+            row = cur.fetchone()
+            if not row:
+                return
+
+            attempts = int(row['attempts'] or 0) + 1
+            if attempts >= _MAX_SEND_ATTEMPTS:
+                cur.execute(
+                    "UPDATE scheduled_emails SET status = 'failed', attempts = %s WHERE id = %s",
+                    (attempts, row['id'])
+                )
+            else:
+                backoff = _RETRY_BACKOFF_MINUTES[min(attempts - 1, len(_RETRY_BACKOFF_MINUTES) - 1)]
+                cur.execute("""
+                    UPDATE scheduled_emails
+                    SET attempts = %s, next_attempt_at = NOW() + make_interval(mins => %s)
+                    WHERE id = %s
+                """, (attempts, backoff, row['id']))
+    except Exception:
+        pass
+
+
+def get_pending_scheduled(campaign_id: str) -> List[Dict]:
+    """
+    Retorna itens pendentes da fila de uma campanha (com raw_data do
+    lead para reconstruir o dict original após restart).
+    """
+    try:
+        with get_cursor() as cur:
+            cur.execute("""
+                SELECT se.lead_id, se.attempts, se.next_attempt_at,
+                       l.raw_data, l.score
+                FROM scheduled_emails se
+                JOIN leads l ON l.id = se.lead_id
+                WHERE se.campaign_id = %s AND se.status = 'pending'
+                ORDER BY l.score DESC
+            """, (campaign_id,))
+            return [_row_to_dict(row) for row in cur.fetchall()]
+    except Exception:
+        return []
+
+
+def find_resumable_campaign() -> Optional[Dict]:
+    """
+    Encontra a campanha mais recente com envios pendentes na fila
+    (para oferecer retomada após restart do processo).
+    """
+    try:
+        with get_cursor() as cur:
+            cur.execute("""
+                SELECT c.id, c.name, COUNT(*) as pending_count
+                FROM scheduled_emails se
+                JOIN campaigns c ON c.id = se.campaign_id
+                WHERE se.status = 'pending'
+                GROUP BY c.id, c.name
+                ORDER BY MAX(se.created_at) DESC
+                LIMIT 1
+            """)
+            row = cur.fetchone()
+            return _row_to_dict(row) if row else None
+    except Exception:
+        return None
+
+
 # === Settings Functions (NOVO) ===
 
 def get_setting(key: str, default: str = None) -> str:
@@ -722,7 +954,7 @@ def insert_email_event(email_log_id: str, event_type: str, payload: dict = None)
             cur.execute("""
                 INSERT INTO email_events (email_log_id, event_type, payload, created_at)
                 VALUES (%s, %s, %s, NOW())
-            """, (email_log_id, event_type, json.dumps(payload or {})))
+            """, (email_log_id, event_type, _json_dumps(payload or {})))
     except Exception:
         pass
 
@@ -782,6 +1014,42 @@ def get_campaign_summary() -> List[Dict]:
         return [_row_to_dict(row) for row in cur.fetchall()]
 
 
+def get_campaign_totals() -> tuple:
+    """
+    Retorna (total_campanhas, total_leads, total_enviados) em uma
+    única query agregada (substitui os sum() em Python do tab5).
+    """
+    try:
+        with get_cursor() as cur:
+            cur.execute("""
+                SELECT COUNT(*) as total_camp,
+                       COALESCE(SUM(c.total_leads), 0) as total_leads,
+                       (SELECT COUNT(*) FROM email_log WHERE status = 'sent') as total_sent
+                FROM campaigns c
+            """)
+            row = cur.fetchone()
+            return (
+                int(row['total_camp'] or 0),
+                int(row['total_leads'] or 0),
+                int(row['total_sent'] or 0),
+            )
+    except Exception:
+        return 0, 0, 0
+
+
+def get_email_status_counts(campaign_id: str) -> Dict[str, int]:
+    """Conta emails por status de uma campanha em uma query agregada"""
+    try:
+        with get_cursor() as cur:
+            cur.execute("""
+                SELECT status, COUNT(*) as cnt FROM email_log
+                WHERE campaign_id = %s GROUP BY status
+            """, (campaign_id,))
+            return {row['status']: int(row['cnt']) for row in cur.fetchall()}
+    except Exception:
+        return {}
+
+
 def get_daily_send_stats(days: int = 30) -> List[Dict]:
     """Retorna contagem de emails por dia"""
     with get_cursor() as cur:
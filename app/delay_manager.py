@@ -3,8 +3,11 @@ Sistema de delays inteligentes para evitar detecção de spam
 """
 import random
 from datetime import datetime, time
+from time import monotonic
 from typing import Tuple
 
+import numpy as np
+
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -43,6 +46,80 @@ def get_smart_delay(email_count: int = 0) -> float:
     return max(DELAY_MIN, delay)
 
 
+def precompute_delays(n: int, email_count: int = 0) -> np.ndarray:
+    """
+    Gera n delays humanizados de uma vez com o RNG vetorizado do NumPy.
+
+    Mesma distribuição de get_smart_delay (gauss * jitter + pausa extra
+    por batch, mínimo DELAY_MIN), mas em chamadas C únicas em vez de N
+    idas ao random do Python — relevante para estimativas e backfills
+    com centenas de envios.
+
+    Args:
+        n: Quantidade de delays
+        email_count: Emails já enviados na sessão (alinha as pausas de batch)
+
+    Returns:
+        np.ndarray float64 com n delays em segundos
+    """
+    if n <= 0:
+        return np.empty(0)
+
+    rng = np.random.default_rng()
+    delays = rng.normal(DELAY_MEAN, DELAY_STD, n) * rng.uniform(0.8, 1.2, n)
+
+    counts = np.arange(email_count, email_count + n)
+    batch_mask = (counts > 0) & (counts % DELAY_BATCH_PAUSE == 0)
+    n_batches = int(batch_mask.sum())
+    if n_batches:
+        delays[batch_mask] += rng.uniform(
+            DELAY_BATCH_EXTRA_MIN, DELAY_BATCH_EXTRA_MAX, n_batches
+        )
+
+    return np.maximum(DELAY_MIN, delays)
+
+
+class SendPacer:
+    """
+    Token bucket de capacidade 1 para espaçar envios sem bloquear.
+
+    Em vez de `time.sleep(delay)` segurando a thread do script, cada
+    tentativa consulta `try_acquire`: se o token está disponível o envio
+    acontece e o próximo token é agendado com o delay gaussiano
+    humanizado; senão retorna quanto falta, e o caller decide dormir
+    pouco e tentar de novo (mantendo a UI responsiva).
+    """
+
+    def __init__(self):
+        self._next_ok = 0.0
+
+    def try_acquire(self, email_count: int = 0) -> Tuple[bool, float]:
+        """
+        Tenta consumir o token de envio.
+
+        Returns:
+            Tuple[acquired, wait_seconds]: (True, 0) se pode enviar
+            agora; (False, segundos_restantes) caso contrário.
+        """
+        now = monotonic()
+        if now >= self._next_ok:
+            self._next_ok = now + get_smart_delay(email_count)
+            return True, 0.0
+        return False, self._next_ok - now
+
+    def reset(self):
+        """Libera o token imediatamente (início de nova campanha)"""
+        self._next_ok = 0.0
+
+
+_send_pacer = SendPacer()
+
+
+def get_send_pacer() -> SendPacer:
+    """Retorna o pacer global de envios (um por processo)"""
+    return _send_pacer
+
+
 def is_within_work_hours() -> Tuple[bool, str]:
     """
     Verifica se estamos dentro do horário comercial permitido
@@ -102,11 +179,9 @@ def estimate_completion_time(emails_pending: int, email_count: int = 0) -> str:
     """
     if emails_pending == 0:
         return "Nenhum email pendente"
-    
-    # Calcula delays estimados
-    total_seconds = 0
-    for i in range(emails_pending):
-        total_seconds += get_smart_delay(email_count + i)
+
+    # Calcula delays estimados (lote único vetorizado)
+    total_seconds = float(precompute_delays(emails_pending, email_count).sum())
     
     # Converte para formato legível
     hours = int(total_seconds // 3600)
@@ -2,10 +2,12 @@
 Integração com Resend API para envio de emails
 """
 import resend
+import requests
 import time
 from typing import Dict, Tuple, Optional
 from datetime import datetime
 from functools import wraps
+from resend.http_client_requests import RequestsClient
 
 import sys
 from pathlib import Path
@@ -21,8 +23,40 @@ from app.lead_processor import get_lead_email
 from config.settings import MAX_ATTEMPTS_PER_LEAD
 
 
+class _KeepAliveClient(RequestsClient):
+    """
+    Cliente HTTP do Resend com conexão persistente.
+
+    O RequestsClient padrão usa requests.request por chamada, pagando
+    handshake TCP+TLS a cada email. Uma Session reaproveita a conexão
+    (keep-alive) entre envios da mesma campanha.
+    """
+
+    def __init__(self, timeout: int = 30):
+        super().__init__(timeout)
+        self._session = requests.Session()
+
+    def request(self, method, url, headers, json=None, files=None, data=None):
+        try:
+            if files is not None:
+                resp = self._session.request(
+                    method=method, url=url, headers=headers,
+                    files=files, data=data, timeout=self._timeout,
+                )
+            else:
+                resp = self._session.request(
+                    method=method, url=url, headers=headers,
+                    json=json if data is None else None,
+                    data=data, timeout=self._timeout,
+                )
+            return resp.content, resp.status_code, resp.headers
+        except requests.RequestException as e:
+            raise RuntimeError(f"Request failed: {e}") from e
+
+
 # Configura Resend
 resend.api_key = RESEND_API_KEY
+resend.default_http_client = _KeepAliveClient()
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -93,7 +127,28 @@ def _send_via_resend(email_to: str, subject: str, body: str,
     })
 
 
-def send_email(lead: Dict, campaign_id: int, lead_id: int, use_llm: bool = False) -> Tuple[bool, str, Optional[str]]:
+def generate_email_content(lead: Dict, use_llm: bool = False) -> Dict:
+    """
+    Gera o conteúdo do email (assunto + corpo) para um lead.
+
+    Separado do envio para permitir pré-geração em background
+    enquanto o rate limiter aguarda a janela do próximo envio.
+    """
+    if use_llm:
+        # Usa IA para gerar email personalizado
+        try:
+            from app.llm_processor import generate_email_with_llm_sync
+            insights = lead.get('llm_insights', '')
+            return generate_email_with_llm_sync(lead, insights)
+        except Exception:
+            # Fallback para template se LLM falhar
+            return personalize_template(lead)
+    # Usa template padrão
+    return personalize_template(lead)
+
+
+def send_email(lead: Dict, campaign_id: int, lead_id: int, use_llm: bool = False,
+               email_content: Dict = None) -> Tuple[bool, str, Optional[str]]:
     """
     Envia email para um lead usando Resend com retry automático.
 
@@ -102,6 +157,7 @@ def send_email(lead: Dict, campaign_id: int, lead_id: int, use_llm: bool = False
         campaign_id: ID da campanha
         lead_id: ID do lead no banco
         use_llm: Se True, gera email personalizado com IA
+        email_content: Conteúdo pré-gerado (opcional, evita gerar aqui)
 
     Returns:
         Tuple[success, message, resend_id]
@@ -121,19 +177,9 @@ def send_email(lead: Dict, campaign_id: int, lead_id: int, use_llm: bool = False
     if attempts >= MAX_ATTEMPTS_PER_LEAD:
         return False, f"Limite de tentativas atingido ({attempts}/{MAX_ATTEMPTS_PER_LEAD})", None
 
-    # Gera conteúdo do email
-    if use_llm:
-        # Usa IA para gerar email personalizado
-        try:
-            from app.llm_processor import generate_email_with_llm_sync
-            insights = lead.get('llm_insights', '')
-            email_content = generate_email_with_llm_sync(lead, insights)
-        except Exception as e:
-            # Fallback para template se LLM falhar
-            email_content = personalize_template(lead)
-    else:
-        # Usa template padrão
-        email_content = personalize_template(lead)
+    # Gera conteúdo do email (se não veio pré-gerado)
+    if email_content is None:
+        email_content = generate_email_content(lead, use_llm=use_llm)
 
     # Registra tentativa no banco (com corpo do email)
     log_id = log_email_attempt(
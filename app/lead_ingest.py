@@ -0,0 +1,185 @@
+"""
+Ingestão vetorizada de leads com pandas.
+
+Para lotes grandes (milhares de leads colados de uma vez), o loop
+Python por lead vira gargalo. Aqui a normalização, validação de
+sintaxe e deduplicação rodam como operações de coluna (kernels C do
+pandas/NumPy), e os dicts só são materializados para os sobreviventes.
+"""
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import (
+    SCORE_EMAIL_EXISTS, SCORE_EMAIL_TYPE, SCORE_CONFIDENCE,
+    SCORE_DECISOR_IDENTIFIED, SCORE_HAS_WEBSITE
+)
+from app.lead_processor import get_lead_email, get_lead_decisor
+
+# Mesmo padrão de validate_email_syntax (lead_processor.py)
+EMAIL_RE = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+
+# Tabelas de score codificadas para gather vetorizado: o código do tipo
+# indexa o array de pontos via np.take (último slot = desconhecido -> 0)
+_EMAIL_TYPE_CODES = {k: i for i, k in enumerate(SCORE_EMAIL_TYPE)}
+_EMAIL_TYPE_SCORES = np.array(
+    list(SCORE_EMAIL_TYPE.values()) + [0], dtype=np.int16
+)
+_CONFIDENCE_CODES = {k: i for i, k in enumerate(SCORE_CONFIDENCE)}
+_CONFIDENCE_SCORES = np.array(
+    list(SCORE_CONFIDENCE.values()) + [0], dtype=np.int16
+)
+
+
+def leads_to_dataframe(leads: List[Dict]) -> pd.DataFrame:
+    """
+    Converte a lista de leads em DataFrame com coluna 'email'
+    normalizável, mantendo o dict original na coluna '_lead'.
+    """
+    return pd.DataFrame({
+        'email': [get_lead_email(lead) for lead in leads],
+        '_lead': leads,
+    })
+
+
+def ingest_dataframe(
+    df: pd.DataFrame,
+    sent_emails: Optional[set] = None,
+) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """
+    Classifica leads de forma vetorizada.
+
+    Args:
+        df: DataFrame com colunas 'email' e '_lead'
+        sent_emails: conjunto de emails (lowercase) já contatados
+
+    Returns:
+        Tuple (valid_df, discarded_df, duplicates_df):
+        - valid_df: sintaxe ok, email inédito no lote e não contatado
+        - discarded_df: sem email ou sintaxe inválida
+        - duplicates_df: repetidos no lote ou já contatados
+    """
+    if df.empty:
+        empty = df.iloc[0:0]
+        return empty, empty.copy(), empty.copy()
+
+    df = df.copy()
+    df['email'] = df['email'].fillna('').astype(str).str.strip().str.lower()
+
+    mask_syntax = df['email'].str.match(EMAIL_RE)
+    mask_intra_dup = df['email'].duplicated(keep='first') & mask_syntax
+
+    if sent_emails:
+        mask_sent = df['email'].isin(sent_emails)
+    else:
+        mask_sent = pd.Series(False, index=df.index)
+
+    mask_discarded = ~mask_syntax
+    mask_duplicate = mask_syntax & (mask_intra_dup | mask_sent)
+    mask_valid = mask_syntax & ~mask_duplicate
+
+    return df[mask_valid], df[mask_discarded], df[mask_duplicate]
+
+
+def score_leads_vectorized(leads: List[Dict]) -> np.ndarray:
+    """
+    Calcula o score de um lote de leads em operações vetorizadas.
+
+    Mesmos critérios de calculate_lead_score (lead_processor.py), mas
+    as tabelas de pontos viram gathers NumPy em vez de N lookups de
+    dict em loop Python. A checagem de blacklist (acesso a banco) fica
+    fora daqui — aplique-a sobre os sobreviventes.
+
+    Returns:
+        np.ndarray int16 com um score 0-100 por lead (0 = sem email)
+    """
+    if not leads:
+        return np.empty(0, dtype=np.int16)
+
+    emails = pd.Series([get_lead_email(lead) for lead in leads])
+    has_email = emails.str.match(EMAIL_RE).fillna(False).to_numpy()
+
+    email_tipos = pd.Series([
+        (lead.get('contatos') or {}).get('email_tipo') or lead.get('email_tipo', '')
+        for lead in leads
+    ])
+    confiancas = pd.Series([lead.get('confianca', '') for lead in leads])
+
+    fallback_tipo = len(_EMAIL_TYPE_SCORES) - 1
+    fallback_conf = len(_CONFIDENCE_SCORES) - 1
+    tipo_codes = email_tipos.map(_EMAIL_TYPE_CODES).fillna(fallback_tipo).to_numpy(dtype=np.intp)
+    conf_codes = confiancas.map(_CONFIDENCE_CODES).fillna(fallback_conf).to_numpy(dtype=np.intp)
+
+    has_decisor = np.fromiter(
+        (bool(get_lead_decisor(lead)['nome']) for lead in leads),
+        dtype=bool, count=len(leads)
+    )
+    has_site = np.fromiter(
+        (bool(lead.get('site')) for lead in leads),
+        dtype=bool, count=len(leads)
+    )
+
+    scores = (
+        SCORE_EMAIL_EXISTS
+        + _EMAIL_TYPE_SCORES.take(tipo_codes)
+        + _CONFIDENCE_SCORES.take(conf_codes)
+        + SCORE_DECISOR_IDENTIFIED * has_decisor
+        + SCORE_HAS_WEBSITE * has_site
+    )
+    return np.where(has_email, np.minimum(scores, 100), 0).astype(np.int16)
+
+
+def prefilter_contacted(
+    leads: List[Dict],
+    sent_emails: Optional[set],
+) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Dedup intra-lote + pré-filtro de já contatados, vetorizado.
+
+    Duplicatas exatas dentro do lote são descartadas (primeira
+    ocorrência vence; leads sem email são todos mantidos). Com
+    sent_emails=None (conjunto indisponível), tudo vai para maybe_dup
+    e paga a verificação completa no banco.
+
+    Returns:
+        Tuple (definitely_new, maybe_dup): novos com certeza vs.
+        candidatos que precisam da checagem batched de duplicatas
+    """
+    df = leads_to_dataframe(leads)
+    if df.empty:
+        return [], []
+
+    df['email'] = df['email'].fillna('').astype(str).str.strip().str.lower()
+    has_email = df['email'] != ''
+    df = df[~(df['email'].duplicated(keep='first') & has_email)]
+
+    if sent_emails is None:
+        return [], df['_lead'].tolist()
+
+    mask_sent = df['email'].isin(sent_emails) & (df['email'] != '')
+    return df.loc[~mask_sent, '_lead'].tolist(), df.loc[mask_sent, '_lead'].tolist()
+
+
+def ingest_leads(
+    leads: List[Dict],
+    sent_emails: Optional[set] = None,
+) -> Tuple[List[Dict], List[Dict], List[Dict]]:
+    """
+    Versão de conveniência que recebe e devolve listas de dicts.
+
+    Returns:
+        Tuple (valid_leads, discarded_leads, duplicate_leads)
+    """
+    valid_df, discarded_df, duplicates_df = ingest_dataframe(
+        leads_to_dataframe(leads), sent_emails
+    )
+    return (
+        valid_df['_lead'].tolist(),
+        discarded_df['_lead'].tolist(),
+        duplicates_df['_lead'].tolist(),
+    )
@@ -3,6 +3,7 @@ Processamento e scoring de leads para automação de emails
 """
 import re
 import json
+from functools import lru_cache
 from typing import Dict, List, Tuple, Optional
 
 try:
@@ -125,32 +126,40 @@ def process_leads(leads: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
     Returns:
         Tuple[valid_leads, discarded_leads]
     """
+    # Import tardio: lead_ingest importa helpers deste módulo
+    from app.lead_ingest import score_leads_vectorized
+
     valid_leads = []
     discarded_leads = []
     pending_smtp = []  # leads que passaram MX e aguardam verificação SMTP
 
-    # Fase 1: score + validação MX (rápido, sem API externa)
-    for lead in leads:
-        score = calculate_lead_score(lead)
+    # Fase 1: scores do lote inteiro em kernels vetorizados (mesmos
+    # critérios de calculate_lead_score), depois blacklist + MX por lead
+    scores = score_leads_vectorized(leads)
+    for lead, score in zip(leads, scores.tolist()):
         lead['score'] = score
 
-        if score == -1:
+        if score == 0:
+            lead['discard_reason'] = 'Sem email válido'
+            discarded_leads.append(lead)
+            continue
+
+        email = get_lead_email(lead)
+        if is_blacklisted(email):
+            lead['score'] = -1
             lead['discard_reason'] = 'Email na blacklist'
             discarded_leads.append(lead)
-        elif score == 0:
-            lead['discard_reason'] = 'Sem email válido'
+            continue
+
+        mx_valid, mx_message = validate_email_mx(email)
+        lead['mx_valid'] = mx_valid
+        lead['mx_message'] = mx_message
+
+        if not mx_valid:
+            lead['discard_reason'] = f'MX inválido: {mx_message}'
             discarded_leads.append(lead)
         else:
-            email = lead.get('contatos', {}).get('email_principal')
-            mx_valid, mx_message = validate_email_mx(email)
-            lead['mx_valid'] = mx_valid
-            lead['mx_message'] = mx_message
-
-            if not mx_valid:
-                lead['discard_reason'] = f'MX inválido: {mx_message}'
-                discarded_leads.append(lead)
-            else:
-                pending_smtp.append(lead)
+            pending_smtp.append(lead)
 
     # Fase 2: verificação SMTP em paralelo (todos os leads elegíveis de uma vez)
     if pending_smtp:
@@ -196,22 +205,32 @@ def get_lead_display_info(lead: Dict) -> Dict:
     }
 
 
+@lru_cache(maxsize=4096)
+def _template_type_for(decisor_nome: str) -> str:
+    """Resolve o template a partir do nome do decisor (memoizado)"""
+    return 'decisor_identificado' if decisor_nome else 'sem_decisor'
+
+
 def get_template_type(lead: Dict) -> str:
     """Determina qual template usar baseado nos dados do lead"""
-    decisor = lead.get('decisor', {})
-    if decisor.get('nome'):
-        return 'decisor_identificado'
-    return 'sem_decisor'
+    # Chave leve (só o campo relevante) para o cache — re-renders de
+    # preview/retry do mesmo lead viram hit
+    return _template_type_for(lead.get('decisor', {}).get('nome') or '')
 
 
-def extract_city_from_lead(lead: Dict) -> str:
-    """Extrai apenas a cidade do campo cidade_uf"""
-    cidade_uf = lead.get('cidade_uf', '')
+@lru_cache(maxsize=4096)
+def _city_from(cidade_uf: str) -> str:
+    """Extrai a cidade de uma string 'Cidade - UF' (memoizado)"""
     if ' - ' in cidade_uf:
         return cidade_uf.split(' - ')[0].strip()
     return cidade_uf
 
 
+def extract_city_from_lead(lead: Dict) -> str:
+    """Extrai apenas a cidade do campo cidade_uf"""
+    return _city_from(lead.get('cidade_uf', ''))
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # HELPERS DRY - Funções auxiliares para extração de dados de leads
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -4,30 +4,43 @@ Interface Streamlit para Automação de Envio de Emails ABAplay
 import streamlit as st
 import time
 import json
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from config.settings import DAILY_EMAIL_LIMIT, WORK_HOURS_START, WORK_HOURS_END, GEMINI_MODELS, GEMINI_MODEL
+from config.settings import (
+    DAILY_EMAIL_LIMIT, WORK_HOURS_START, WORK_HOURS_END, GEMINI_MODELS,
+    GEMINI_MODEL, REOON_API_KEY
+)
 from app.database import (
     init_database, create_campaign, update_campaign_stats,
     insert_lead, get_leads_by_campaign, get_email_log_by_campaign,
     get_campaign, add_to_blacklist, get_blacklist, check_leads_for_duplicates,
     get_setting, set_setting, update_lead_status, remove_from_blacklist,
-    add_multiple_to_blacklist, get_campaign_summary
+    add_multiple_to_blacklist, get_campaign_summary, get_sent_emails_set,
+    insert_leads_bulk, enqueue_emails, mark_scheduled_sent,
+    mark_scheduled_failed, get_pending_scheduled, find_resumable_campaign,
+    get_campaign_totals
 )
 from app.lead_processor import (
     parse_leads_json, process_leads, get_lead_display_info, calculate_lead_score,
     get_lead_email
 )
+from app.lead_ingest import prefilter_contacted
 from app.email_validator import validate_email_smtp, validate_email_smtp_batch, get_reoon_credits
 from app.delay_manager import (
     get_smart_delay, can_send_email, get_remaining_emails_today,
-    estimate_completion_time, format_delay_for_display, is_within_work_hours
+    estimate_completion_time, format_delay_for_display, is_within_work_hours,
+    get_send_pacer
+)
+from app.email_sender import (
+    send_email, test_connection, get_sender_info, generate_email_preview,
+    generate_email_content
 )
-from app.email_sender import send_email, test_connection, get_sender_info, generate_email_preview
 from app.template_engine import preview_email, personalize_template
 from app.report_generator import generate_campaign_report, generate_quick_summary
 from app.llm_processor import (
@@ -37,9 +50,10 @@ from app.data_viewer import render_data_viewer
 from app.gemini_prospector import prospect_leads, test_gemini_connection
 from app.email_history import render_email_history
 from app.ui_components import (
-    inject_custom_css, render_header, render_metric_card, render_lead_card,
-    render_progress_tracker, render_empty_state, render_success_message,
-    render_info_box, render_status_bar, render_compact_metric
+    inject_custom_css, render_header, render_metric_card, render_metrics_row,
+    render_lead_card, render_progress_tracker, render_empty_state,
+    render_success_message, render_info_box, render_status_bar,
+    render_compact_metric
 )
 
 
@@ -49,6 +63,28 @@ def _get_reoon_credits_cached():
     return get_reoon_credits()
 
 
+@st.cache_data(ttl=30)
+def _get_campaign_totals_cached():
+    """Totais agregados do histórico (30s de cache por rerun)"""
+    return get_campaign_totals()
+
+
+@st.cache_resource
+def _get_send_executor():
+    """Executor compartilhado para pré-gerar emails em background."""
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix='email-prefetch')
+
+
+@st.cache_resource
+def _load_sent_email_filter() -> set:
+    """
+    Conjunto de emails já contatados (180 dias), carregado uma vez por
+    sessão. Pré-filtro em memória: leads fora do conjunto são novos
+    com certeza e pulam a query de duplicatas.
+    """
+    return get_sent_emails_set(days=180)
+
+
 # === Persistência de Configurações (via banco SQL) ===
 
 def load_user_config() -> dict:
@@ -207,9 +243,8 @@ def render_settings_tab():
 
         # Status Reoon
         st.markdown("### 🔍 Validação de E-mails (Reoon)")
-        from config.settings import REOON_API_KEY as _reoon_key
         reoon_credits_now, reoon_err_now = get_reoon_credits()
-        if _reoon_key:
+        if REOON_API_KEY:
             if reoon_credits_now >= 0:
                 cor = "success" if reoon_credits_now > 5 else "warning" if reoon_credits_now > 0 else "error"
                 render_compact_metric(str(reoon_credits_now), "Créditos restantes hoje", "🔍", cor)
@@ -398,7 +433,22 @@ def _process_leads_json(json_input: str):
             valid_leads, discarded_leads = process_leads(leads)
 
         # === VERIFICAÇÃO DE DUPLICATAS (180 dias) ===
-        leads_novos, leads_duplicados = check_leads_for_duplicates(valid_leads, days=180)
+        # Dedup intra-lote + pré-filtro de contatados vetorizados: só
+        # leads cujo email aparece no conjunto de enviados precisam da
+        # verificação batched no banco. Se o conjunto não carregar, o
+        # erro não fica cacheado e todo o lote paga a checagem completa
+        try:
+            sent_filter = _load_sent_email_filter()
+        except Exception:
+            sent_filter = None
+            st.warning("⚠️ Pré-filtro de enviados indisponível — verificando todos os leads no banco.")
+        definitely_new, maybe_dup = prefilter_contacted(valid_leads, sent_filter)
+        for lead in definitely_new:
+            lead['is_duplicate'] = False
+
+        leads_novos, leads_duplicados = check_leads_for_duplicates(maybe_dup, days=180)
+        leads_novos = definitely_new + leads_novos
+        leads_novos.sort(key=lambda x: x.get('score', 0), reverse=True)
 
         if leads_duplicados:
             st.warning(f"⚠️ {len(leads_duplicados)} lead(s) já foram contatados nos últimos 180 dias!")
@@ -414,6 +464,9 @@ def _process_leads_json(json_input: str):
             lead['db_id'] = insert_lead(campaign_id, lead)
             update_lead_status(lead['db_id'], 'queued')
 
+        # Persiste a fila de envio (sobrevive a restart do processo)
+        enqueue_emails(campaign_id, [l['db_id'] for l in leads_novos])
+
         # Insere também leads descartados no banco (dados valiosos mesmo sem email)
         for lead in discarded_leads:
             lead['db_id'] = insert_lead(campaign_id, lead)
@@ -602,9 +655,48 @@ def render_lead_input():
                 _clear_session()
 
 
+def _render_resume_campaign():
+    """Oferece retomada de campanha com envios pendentes (fila persistida)"""
+    resumable = find_resumable_campaign()
+    if not resumable:
+        return
+
+    st.info(
+        f"🔄 A campanha **{resumable.get('name', 'N/A')}** tem "
+        f"**{resumable.get('pending_count', 0)}** envio(s) pendente(s) na fila."
+    )
+    if st.button("▶️ Retomar campanha interrompida", type="primary"):
+        pending = get_pending_scheduled(resumable['id'])
+        restored = []
+        for item in pending:
+            # raw_data é JSONB: o psycopg2 já entrega dict; string só
+            # aparece em dados legados
+            raw = item.get('raw_data')
+            if isinstance(raw, dict):
+                lead = raw
+            else:
+                try:
+                    lead = json.loads(raw or '{}')
+                except (json.JSONDecodeError, TypeError):
+                    continue
+            lead['db_id'] = item['lead_id']
+            restored.append(lead)
+
+        if restored:
+            st.session_state.campaign_id = resumable['id']
+            st.session_state.valid_leads = restored
+            st.session_state.current_lead_index = 0
+            st.session_state.emails_sent_session = 0
+            st.success(f"✅ {len(restored)} leads restaurados da fila!")
+            st.rerun()
+        else:
+            st.warning("Não foi possível restaurar os leads da fila.")
+
+
 def render_lead_queue():
     """Renderiza fila de leads para envio com ações em massa"""
     if not st.session_state.valid_leads:
+        _render_resume_campaign()
         render_empty_state("Nenhum lead na fila. Cole um JSON de leads na aba 'Nova Campanha'.", "📭")
         return
 
@@ -618,16 +710,12 @@ def render_lead_queue():
     remaining_today = get_remaining_emails_today(st.session_state.daily_limit)
     sent_today = st.session_state.daily_limit - remaining_today
 
-    col1, col2, col3, col4 = st.columns(4)
-
-    with col1:
-        render_metric_card(str(pending), "Na Fila", "📋", "primary")
-    with col2:
-        render_metric_card(str(sent_today), "Enviados Hoje", "✅", "success")
-    with col3:
-        render_metric_card(str(discarded), "Descartados", "❌", "error")
-    with col4:
-        render_metric_card(str(remaining_today), "Restam Hoje", "📊", "warning")
+    render_metrics_row([
+        {'value': str(pending), 'label': "Na Fila", 'icon': "📋", 'variant': "primary"},
+        {'value': str(sent_today), 'label': "Enviados Hoje", 'icon': "✅", 'variant': "success"},
+        {'value': str(discarded), 'label': "Descartados", 'icon': "❌", 'variant': "error"},
+        {'value': str(remaining_today), 'label': "Restam Hoje", 'icon': "📊", 'variant': "warning"},
+    ])
     
     # Estimativa de tempo
     if pending > 0:
@@ -690,40 +778,45 @@ def render_lead_queue():
     # Lista de leads com cards estilizados
     st.markdown("### 📋 Leads Ordenados por Score")
 
-    for i, lead in enumerate(st.session_state.valid_leads):
-        # Define status do lead
-        if i < st.session_state.current_lead_index:
-            status_text = "sent"
-        elif i == st.session_state.current_lead_index and st.session_state.sending_active:
-            status_text = "pending"
-        else:
-            status_text = "pending"
+    for i in range(len(st.session_state.valid_leads)):
+        _render_lead_row(i)
 
-        # Checkbox de seleção + card
-        col_check, col_status, col_card = st.columns([0.4, 0.4, 9.2])
 
-        with col_check:
-            if i >= st.session_state.current_lead_index and not st.session_state.sending_active:
-                is_selected = i in st.session_state.get('selected_leads', set())
-                if st.checkbox("", value=is_selected, key=f"sel_{i}", label_visibility="collapsed"):
-                    st.session_state.setdefault('selected_leads', set()).add(i)
-                else:
-                    st.session_state.setdefault('selected_leads', set()).discard(i)
+@st.fragment
+def _render_lead_row(i: int):
+    """
+    Renderiza a linha de um lead (checkbox + status + card) como fragment.
+
+    Marcar/desmarcar o checkbox reexecuta só esta linha, não o script
+    inteiro com todos os cards da fila.
+    """
+    lead = st.session_state.valid_leads[i]
 
-        with col_status:
-            if i < st.session_state.current_lead_index:
-                st.markdown("✅")
-            elif i == st.session_state.current_lead_index and st.session_state.sending_active:
-                st.markdown("📤")
+    # Checkbox de seleção + card
+    col_check, col_status, col_card = st.columns([0.4, 0.4, 9.2])
+
+    with col_check:
+        if i >= st.session_state.current_lead_index and not st.session_state.sending_active:
+            is_selected = i in st.session_state.get('selected_leads', set())
+            if st.checkbox("", value=is_selected, key=f"sel_{i}", label_visibility="collapsed"):
+                st.session_state.setdefault('selected_leads', set()).add(i)
             else:
-                st.markdown(f"**{i+1}**")
+                st.session_state.setdefault('selected_leads', set()).discard(i)
 
-        with col_card:
-            render_lead_card(lead, show_details=True)
+    with col_status:
+        if i < st.session_state.current_lead_index:
+            st.markdown("✅")
+        elif i == st.session_state.current_lead_index and st.session_state.sending_active:
+            st.markdown("📤")
+        else:
+            st.markdown(f"**{i+1}**")
+
+    with col_card:
+        render_lead_card(lead, show_details=True)
 
-            # Mostra insights da IA se disponível
-            if lead.get('llm_insights'):
-                st.caption(f"💡 IA: {lead.get('llm_insights')}")
+        # Mostra insights da IA se disponível
+        if lead.get('llm_insights'):
+            st.caption(f"💡 IA: {lead.get('llm_insights')}")
 
 
 def render_send_controls():
@@ -809,48 +902,81 @@ def send_emails_with_delay():
     # Pega próximo lead
     lead = valid_leads[current_idx]
     lead_id = lead.get('db_id')
-    
+
     # Exibe status
     status_container = st.container()
     with status_container:
         st.markdown(f"### 📤 Enviando para: {lead.get('nome_clinica')}")
         progress = st.progress(0)
         status_text = st.empty()
-    
-    # Calcula delay
-    delay = get_smart_delay(st.session_state.emails_sent_session)
-    delay_formatted = format_delay_for_display(delay)
-    
-    # Envia email
+
+    # Pré-gera o conteúdo em background: a geração via LLM (vários
+    # segundos) roda em paralelo com a espera do rate limiter
+    if st.session_state.get('prefetch_index') != current_idx:
+        st.session_state.prefetch_future = _get_send_executor().submit(
+            generate_email_content, lead, st.session_state.use_llm
+        )
+        st.session_state.prefetch_index = current_idx
+
+    # Rate limit via token bucket: em vez de dormir o delay inteiro
+    # bloqueando a UI, cada rerun dorme no máximo 1s até liberar o token
+    acquired, wait = get_send_pacer().try_acquire(st.session_state.emails_sent_session)
+    if not acquired:
+        status_text.text(f"⏳ Próximo envio em {format_delay_for_display(wait)}...")
+        time.sleep(min(wait, 1.0))
+        if st.session_state.sending_active:
+            st.rerun()
+        return
+
+    # Envia email (usando o conteúdo pré-gerado, se concluído)
     status_text.text(f"🧠 Gerando email personalizado..." if st.session_state.use_llm else "📧 Enviando email...")
     progress.progress(30)
-    
-    success, message, resend_id = send_email(lead, campaign_id, lead_id, use_llm=st.session_state.use_llm)
-    
+
+    try:
+        email_content = st.session_state.prefetch_future.result(timeout=120)
+    except Exception:
+        email_content = None
+    st.session_state.prefetch_index = None
+
+    success, message, resend_id = send_email(
+        lead, campaign_id, lead_id,
+        use_llm=st.session_state.use_llm,
+        email_content=email_content
+    )
+
     if success:
-        progress.progress(60)
-        status_text.text(f"✅ Enviado! Aguardando {delay_formatted} para próximo...")
-        
-        # Atualiza contadores
+        progress.progress(100)
+        status_text.text("✅ Enviado! Aguardando liberação para o próximo...")
+
+        # Atualiza contadores e a fila persistente
+        mark_scheduled_sent(campaign_id, lead_id)
+
+        # Mantém o pré-filtro de duplicatas coerente com o envio recém-
+        # feito: o set cacheado é compartilhado entre sessões, então
+        # basta adicionar o email (sem invalidar e recarregar do banco).
+        # Falha aqui não pode derrubar um envio que já deu certo
+        sent_email = lead.get('contatos', {}).get('email_principal') or lead.get('email_principal')
+        if sent_email:
+            try:
+                _load_sent_email_filter().add(sent_email.strip().lower())
+            except Exception:
+                pass
+
         st.session_state.emails_sent_session += 1
         st.session_state.current_lead_index += 1
-        
+
         update_campaign_stats(
             campaign_id,
             emails_sent=st.session_state.emails_sent_session
         )
-        
-        # Delay antes do próximo
-        progress.progress(80)
-        time.sleep(min(delay, 10))  # Limita delay visual a 10s para UX
-        progress.progress(100)
-        
+
         # Continua se ainda está ativo
         if st.session_state.sending_active:
             st.rerun()
     else:
         progress.progress(100)
         status_text.text(f"❌ Erro: {message}")
+        mark_scheduled_failed(campaign_id, lead_id)
         st.session_state.current_lead_index += 1
         
         update_campaign_stats(
@@ -897,10 +1023,13 @@ def render_duplicate_leads():
     col1, col2 = st.columns([1, 4])
     with col1:
         if st.button("✅ Aprovar Todos", type="primary"):
-            for lead in st.session_state.duplicate_leads:
-                # Insere no banco e adiciona à fila
-                lead['db_id'] = insert_lead(st.session_state.campaign_id, lead)
+            # Insere todos em um único batch e adiciona à fila
+            dup_leads = st.session_state.duplicate_leads
+            db_ids = insert_leads_bulk(st.session_state.campaign_id, dup_leads)
+            for lead, db_id in zip(dup_leads, db_ids):
+                lead['db_id'] = db_id
                 st.session_state.valid_leads.append(lead)
+            enqueue_emails(st.session_state.campaign_id, db_ids)
             st.session_state.duplicate_leads = []
             st.success("✅ Todos os leads duplicados foram aprovados!")
             st.rerun()
@@ -912,53 +1041,56 @@ def render_duplicate_leads():
             st.rerun()
     
     st.divider()
-    
-    # Lista cada lead duplicado
-    for i, lead in enumerate(st.session_state.duplicate_leads):
-        last_sent = lead.get('last_sent_info', {})
-        email = lead.get('contatos', {}).get('email_principal') or lead.get('email_principal', 'N/A')
-        
-        with st.container():
-            cols = st.columns([3, 2, 2, 1])
-            
-            with cols[0]:
-                st.markdown(f"**{lead.get('nome_clinica')}**")
-                st.caption(f"📧 {email}")
-            
-            with cols[1]:
-                sent_date = last_sent.get('sent_at', 'N/A')
-                if sent_date and sent_date != 'N/A':
-                    # Formata data
-                    try:
-                        from datetime import datetime
-                        dt = datetime.strptime(sent_date[:19], '%Y-%m-%d %H:%M:%S')
-                        sent_date = dt.strftime('%d/%m/%Y')
-                    except:
-                        pass
-                st.markdown(f"📅 **Último envio:** {sent_date}")
-                st.caption(f"Campanha: {last_sent.get('campaign_name', 'N/A')}")
-            
-            with cols[2]:
-                days_ago = "N/A"
-                if last_sent.get('sent_at'):
-                    try:
-                        from datetime import datetime
-                        dt = datetime.strptime(last_sent['sent_at'][:19], '%Y-%m-%d %H:%M:%S')
-                        days_ago = (datetime.now() - dt).days
-                    except:
-                        pass
-                st.metric("Dias atrás", days_ago)
-            
-            with cols[3]:
-                if st.button(f"✅ Aprovar", key=f"approve_{i}"):
-                    # Insere no banco e adiciona à fila
-                    lead['db_id'] = insert_lead(st.session_state.campaign_id, lead)
-                    st.session_state.valid_leads.append(lead)
-                    st.session_state.duplicate_leads.remove(lead)
-                    st.success(f"✅ {lead.get('nome_clinica')} aprovado!")
-                    st.rerun()
-            
-            st.divider()
+
+    # Parse das datas em lote (uma passada vetorizada, sem try/except por linha)
+    dup_leads = st.session_state.duplicate_leads
+    sent_series = pd.to_datetime(
+        pd.Series([l.get('last_sent_info', {}).get('sent_at') for l in dup_leads]),
+        errors='coerce'
+    )
+    sent_display = sent_series.dt.strftime('%d/%m/%Y').fillna('N/A')
+    days_ago_series = (pd.Timestamp.now() - sent_series).dt.days
+
+    # Tabela editável única em vez de 4 colunas + botão por lead:
+    # O(1) widgets por rerun independente do número de duplicatas
+    dup_df = pd.DataFrame({
+        'Aprovar': False,
+        'Clínica': [l.get('nome_clinica', 'N/A') for l in dup_leads],
+        'Email': [
+            l.get('contatos', {}).get('email_principal') or l.get('email_principal', 'N/A')
+            for l in dup_leads
+        ],
+        'Último envio': sent_display,
+        'Campanha': [l.get('last_sent_info', {}).get('campaign_name', 'N/A') for l in dup_leads],
+        'Dias atrás': days_ago_series,
+    })
+
+    edited = st.data_editor(
+        dup_df,
+        hide_index=True,
+        width="stretch",
+        column_config={
+            'Aprovar': st.column_config.CheckboxColumn('Aprovar', default=False),
+        },
+        disabled=['Clínica', 'Email', 'Último envio', 'Campanha', 'Dias atrás'],
+        key='dup_editor',
+    )
+
+    approved_idx = edited.index[edited['Aprovar']].tolist()
+    if st.button("✅ Aprovar Selecionados", disabled=not approved_idx):
+        approved = [dup_leads[i] for i in approved_idx]
+        db_ids = insert_leads_bulk(st.session_state.campaign_id, approved)
+        for lead, db_id in zip(approved, db_ids):
+            lead['db_id'] = db_id
+            st.session_state.valid_leads.append(lead)
+        enqueue_emails(st.session_state.campaign_id, db_ids)
+
+        approved_set = set(approved_idx)
+        st.session_state.duplicate_leads = [
+            l for i, l in enumerate(dup_leads) if i not in approved_set
+        ]
+        st.success(f"✅ {len(approved)} lead(s) aprovado(s)!")
+        st.rerun()
 
 
 def main():
@@ -1019,10 +1151,8 @@ def main():
         if not all_campaigns:
             st.info("Nenhuma campanha encontrada. Crie uma nova na aba 'Nova Campanha'.")
         else:
-            # Métricas globais
-            total_camp = len(all_campaigns)
-            total_leads_all = sum(int(c.get('total_leads', 0) or 0) for c in all_campaigns)
-            total_sent_all = sum(int(c.get('actual_sent', 0) or 0) for c in all_campaigns)
+            # Métricas globais (uma query agregada, cacheada por 30s)
+            total_camp, total_leads_all, total_sent_all = _get_campaign_totals_cached()
 
             gcol1, gcol2, gcol3 = st.columns(3)
             gcol1.metric("🎯 Total de Campanhas", total_camp)
@@ -1031,56 +1161,55 @@ def main():
 
             st.divider()
 
-            for camp in all_campaigns:
-                camp_name = camp.get('name', 'Sem nome')
-                camp_region = camp.get('region', 'N/A')
-                camp_status = camp.get('status', 'N/A')
-                camp_total = int(camp.get('total_leads', 0) or 0)
-                camp_sent = int(camp.get('actual_sent', 0) or 0)
-                camp_failed = int(camp.get('emails_failed', 0) or 0)
-                camp_created = camp.get('created_at', '')
+            # Tabela única no lugar do loop de st.columns/st.metric por
+            # campanha (O(1) widgets por rerun, independente do histórico)
+            hist_df = pd.DataFrame(all_campaigns)
+            hist_df['created_display'] = pd.to_datetime(
+                hist_df['created_at'], errors='coerce', utc=True
+            ).dt.strftime('%d/%m/%Y %H:%M').fillna('N/A')
+
+            status_emoji = {'completed': '✅', 'active': '🟡'}
+            totals = pd.to_numeric(hist_df.get('total_leads', 0), errors='coerce').fillna(0).astype(int)
+            sents = pd.to_numeric(hist_df.get('actual_sent', 0), errors='coerce').fillna(0).astype(int)
+            faileds = pd.to_numeric(hist_df.get('emails_failed', 0), errors='coerce').fillna(0).astype(int)
+
+            display_df = pd.DataFrame({
+                'Status': hist_df['status'].map(status_emoji).fillna('⏸️'),
+                'Campanha': hist_df['name'].fillna('Sem nome'),
+                'Região': hist_df['region'].fillna('N/A'),
+                'Data': hist_df['created_display'],
+                'Leads': totals,
+                'Enviados': sents,
+                'Falhas': faileds,
+                'Taxa': (sents / totals.replace(0, pd.NA) * 100).fillna(0).round(0).astype(int),
+            })
+
+            selection = st.dataframe(
+                display_df,
+                hide_index=True,
+                width="stretch",
+                column_config={
+                    'Taxa': st.column_config.ProgressColumn(
+                        'Taxa', format='%d%%', min_value=0, max_value=100
+                    ),
+                },
+                on_select='rerun',
+                selection_mode='single-row',
+            )
 
-                # Formata data
-                try:
-                    if isinstance(camp_created, str) and camp_created:
-                        dt = datetime.fromisoformat(camp_created.replace('Z', '+00:00')) if camp_created else None
-                    else:
-                        dt = camp_created
-                    camp_date_display = dt.strftime('%d/%m/%Y %H:%M') if dt else 'N/A'
-                except Exception:
-                    camp_date_display = str(camp_created)[:16]
-
-                taxa = (camp_sent / camp_total * 100) if camp_total > 0 else 0
-                status_color = '✅' if camp_status == 'completed' else '🟡' if camp_status == 'active' else '⏸️'
-
-                with st.container():
-                    hcol1, hcol2, hcol3, hcol4, hcol5 = st.columns([3, 1, 1, 1, 1])
-                    
-                    with hcol1:
-                        st.markdown(f"{status_color} **{camp_name}**")
-                        st.caption(f"📍 {camp_region} • 📅 {camp_date_display}")
-                    with hcol2:
-                        st.metric("Leads", camp_total)
-                    with hcol3:
-                        st.metric("Enviados", camp_sent)
-                    with hcol4:
-                        st.metric("Falhas", camp_failed)
-                    with hcol5:
-                        st.metric("Taxa", f"{taxa:.0f}%")
-
-                    # Detalhes expandíveis da campanha
-                    with st.expander(f"📧 Ver log de emails — {camp_name}"):
-                        camp_id = camp.get('id')
-                        if camp_id:
-                            logs = get_email_log_by_campaign(camp_id)
-                            if logs:
-                                for log in logs:
-                                    log_emoji = '✅' if log['status'] == 'sent' else '❌'
-                                    st.markdown(f"{log_emoji} **{log.get('nome_clinica', 'N/A')}** — {log['email_to']} — {log['status']}")
-                            else:
-                                st.caption("Nenhum email registrado nesta campanha.")
-
-                    st.divider()
+            # Log de emails só para a campanha selecionada (uma query por interação)
+            selected_rows = selection.selection.rows if selection else []
+            if selected_rows:
+                camp = all_campaigns[selected_rows[0]]
+                camp_id = camp.get('id')
+                st.markdown(f"#### 📧 Log de emails — {camp.get('name', 'Sem nome')}")
+                logs = get_email_log_by_campaign(camp_id) if camp_id else []
+                if logs:
+                    for log in logs:
+                        log_emoji = '✅' if log['status'] == 'sent' else '❌'
+                        st.markdown(f"{log_emoji} **{log.get('nome_clinica', 'N/A')}** — {log['email_to']} — {log['status']}")
+                else:
+                    st.caption("Nenhum email registrado nesta campanha.")
 
     with tab6:
         render_settings_tab()
@@ -1,6 +1,7 @@
 """
 Gerador de relatórios PDF para campanhas de email
 """
+from functools import lru_cache
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List
@@ -10,14 +11,117 @@ from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import cm
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, LongTable, Paragraph, Spacer
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
 
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from config.settings import DESKTOP_PATH
-from app.database import get_campaign, get_leads_by_campaign, get_email_log_by_campaign
+from app.database import (
+    get_campaign, get_leads_by_campaign, get_email_log_by_campaign,
+    get_email_status_counts
+)
+
+
+# Estilos de tabela construídos uma vez no load do módulo e reutilizados
+# em todos os relatórios (TableStyle é imutável entre builds)
+_SUMMARY_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4299e1')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 12),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#f7fafc')),
+    ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e2e8f0')),
+    ('FONTSIZE', (0, 1), (-1, -1), 10),
+    ('TOPPADDING', (0, 1), (-1, -1), 8),
+    ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
+])
+
+_EMAIL_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#48bb78')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e2e8f0')),
+    ('FONTSIZE', (0, 1), (-1, -1), 8),
+    ('TOPPADDING', (0, 1), (-1, -1), 6),
+    ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
+    ('ALIGN', (0, 0), (0, -1), 'CENTER'),
+    ('ALIGN', (1, 1), (2, -1), 'LEFT'),
+])
+
+_DISCARDED_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#fc8181')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#fff5f5')),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#feb2b2')),
+    ('FONTSIZE', (0, 1), (-1, -1), 9),
+    ('TOPPADDING', (0, 1), (-1, -1), 6),
+    ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
+])
+
+
+@lru_cache(maxsize=1)
+def _report_styles() -> Dict:
+    """
+    Constrói (uma vez por processo) a folha de estilos do relatório.
+
+    getSampleStyleSheet + ParagraphStyle são custo fixo por chamada;
+    memoizar amortiza o setup quando vários relatórios são gerados.
+    """
+    styles = getSampleStyleSheet()
+    return {
+        'title': ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=18,
+            alignment=TA_CENTER,
+            spaceAfter=30,
+            textColor=colors.HexColor('#1a365d')
+        ),
+        'heading': ParagraphStyle(
+            'CustomHeading',
+            parent=styles['Heading2'],
+            fontSize=14,
+            spaceAfter=12,
+            textColor=colors.HexColor('#2d3748')
+        ),
+        'normal': styles['Normal'],
+        'footer': ParagraphStyle(
+            'Footer', parent=styles['Normal'], fontSize=8,
+            textColor=colors.gray, alignment=TA_CENTER
+        ),
+    }
+
+
+def _email_row_iter(email_logs: List[Dict]):
+    """Gera linhas da tabela de envios sob demanda (uma tupla por log)"""
+    yield ["#", "Clínica", "Email", "Status", "Horário"]
+    for i, log in enumerate(email_logs, 1):
+        status_emoji = "✅" if log.get('status') == 'sent' else "❌" if log.get('status') == 'failed' else "⏳"
+        sent_time = log.get('sent_at', '')
+        if sent_time:
+            try:
+                sent_time = datetime.fromisoformat(sent_time).strftime('%H:%M')
+            except:
+                sent_time = str(sent_time)[:5]
+        yield [
+            str(i),
+            log.get('nome_clinica', 'N/A')[:25],
+            log.get('email_to', 'N/A')[:30],
+            f"{status_emoji} {log.get('status', 'N/A')}",
+            sent_time
+        ]
 
 
 def generate_campaign_report(campaign_id: int, 
@@ -64,24 +168,11 @@ def generate_campaign_report(campaign_id: int,
         bottomMargin=2*cm
     )
     
-    # Estilos
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=18,
-        alignment=TA_CENTER,
-        spaceAfter=30,
-        textColor=colors.HexColor('#1a365d')
-    )
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=14,
-        spaceAfter=12,
-        textColor=colors.HexColor('#2d3748')
-    )
-    normal_style = styles['Normal']
+    # Estilos (memoizados no módulo)
+    report_styles = _report_styles()
+    title_style = report_styles['title']
+    heading_style = report_styles['heading']
+    normal_style = report_styles['normal']
     
     # Elementos do documento
     elements = []
@@ -95,10 +186,10 @@ def generate_campaign_report(campaign_id: int,
     # Resumo
     elements.append(Paragraph("📈 Resumo da Campanha", heading_style))
     
-    sent_count = len([log for log in email_logs if log.get('status') == 'sent'])
-    failed_count = len([log for log in email_logs if log.get('status') == 'failed'])
-    pending_count = len([log for log in email_logs if log.get('status') == 'pending'])
-    
+    status_counts = get_email_status_counts(campaign_id)
+    sent_count = status_counts.get('sent', 0)
+    failed_count = status_counts.get('failed', 0)
+
     summary_data = [
         ["Métrica", "Valor"],
         ["Total de Leads Processados", str(len(valid_leads) + len(discarded_leads or []))],
@@ -110,60 +201,23 @@ def generate_campaign_report(campaign_id: int,
     ]
     
     summary_table = Table(summary_data, colWidths=[10*cm, 5*cm])
-    summary_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4299e1')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#f7fafc')),
-        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e2e8f0')),
-        ('FONTSIZE', (0, 1), (-1, -1), 10),
-        ('TOPPADDING', (0, 1), (-1, -1), 8),
-        ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
-    ]))
+    summary_table.setStyle(_SUMMARY_TABLE_STYLE)
     elements.append(summary_table)
     elements.append(Spacer(1, 30))
     
     # Emails Enviados
     if email_logs:
         elements.append(Paragraph("📧 Detalhamento dos Envios", heading_style))
-        
-        email_data = [["#", "Clínica", "Email", "Status", "Horário"]]
-        for i, log in enumerate(email_logs, 1):
-            status_emoji = "✅" if log.get('status') == 'sent' else "❌" if log.get('status') == 'failed' else "⏳"
-            sent_time = log.get('sent_at', '')
-            if sent_time:
-                try:
-                    sent_time = datetime.fromisoformat(sent_time).strftime('%H:%M')
-                except:
-                    sent_time = str(sent_time)[:5]
-            
-            email_data.append([
-                str(i),
-                log.get('nome_clinica', 'N/A')[:25],
-                log.get('email_to', 'N/A')[:30],
-                f"{status_emoji} {log.get('status', 'N/A')}",
-                sent_time
-            ])
-        
-        email_table = Table(email_data, colWidths=[1*cm, 4.5*cm, 5.5*cm, 2.5*cm, 2*cm])
-        email_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#48bb78')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e2e8f0')),
-            ('FONTSIZE', (0, 1), (-1, -1), 8),
-            ('TOPPADDING', (0, 1), (-1, -1), 6),
-            ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
-            ('ALIGN', (0, 0), (0, -1), 'CENTER'),
-            ('ALIGN', (1, 1), (2, -1), 'LEFT'),
-        ]))
+
+        # LongTable divide o layout por linha (splitByRow) em vez de uma
+        # passada monolítica — memória estável mesmo com milhares de logs
+        email_table = LongTable(
+            list(_email_row_iter(email_logs)),
+            colWidths=[1*cm, 4.5*cm, 5.5*cm, 2.5*cm, 2*cm],
+            repeatRows=1,
+            splitByRow=1
+        )
+        email_table.setStyle(_EMAIL_TABLE_STYLE)
         elements.append(email_table)
         elements.append(Spacer(1, 30))
     
@@ -178,29 +232,16 @@ def generate_campaign_report(campaign_id: int,
                 lead.get('discard_reason', 'Não especificado')[:40]
             ])
         
-        discarded_table = Table(discarded_data, colWidths=[7*cm, 8*cm])
-        discarded_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#fc8181')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#fff5f5')),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#feb2b2')),
-            ('FONTSIZE', (0, 1), (-1, -1), 9),
-            ('TOPPADDING', (0, 1), (-1, -1), 6),
-            ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
-        ]))
+        discarded_table = LongTable(discarded_data, colWidths=[7*cm, 8*cm],
+                                    repeatRows=1, splitByRow=1)
+        discarded_table.setStyle(_DISCARDED_TABLE_STYLE)
         elements.append(discarded_table)
         elements.append(Spacer(1, 30))
     
     # Rodapé
     elements.append(Spacer(1, 20))
     footer_text = f"Gerado automaticamente por ABAplay Email Automation em {datetime.now().strftime('%d/%m/%Y às %H:%M')}"
-    elements.append(Paragraph(f"<i>{footer_text}</i>", ParagraphStyle(
-        'Footer', parent=normal_style, fontSize=8, textColor=colors.gray, alignment=TA_CENTER
-    )))
+    elements.append(Paragraph(f"<i>{footer_text}</i>", report_styles['footer']))
     
     # Gera PDF
     doc.build(elements)
@@ -216,10 +257,10 @@ def generate_quick_summary(campaign_id: int, valid_leads: List[Dict],
     Returns:
         String formatada com resumo
     """
-    email_logs = get_email_log_by_campaign(campaign_id)
-    sent_count = len([log for log in email_logs if log.get('status') == 'sent'])
-    failed_count = len([log for log in email_logs if log.get('status') == 'failed'])
-    
+    status_counts = get_email_status_counts(campaign_id)
+    sent_count = status_counts.get('sent', 0)
+    failed_count = status_counts.get('failed', 0)
+
     summary = f"""
 ╔══════════════════════════════════════════════════════════════╗
 ║                    📊 RESUMO DA CAMPANHA                      ║
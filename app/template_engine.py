@@ -1,7 +1,9 @@
 """
 Motor de templates de email com personalização
 """
-from typing import Dict
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 
 import sys
 from pathlib import Path
@@ -10,6 +12,79 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from config.settings import TEMPLATES
 from app.lead_processor import get_template_type, extract_city_from_lead
 
+# Compilado uma única vez no load do módulo (evita recompilar por lead)
+_PLACEHOLDER_RE = re.compile(r'\{([^}]+)\}')
+
+
+@lru_cache(maxsize=32)
+def _compile_template(text: str) -> Tuple[Tuple[str, Optional[str]], ...]:
+    """
+    Tokeniza o template em segmentos (literal, nome_da_variável).
+
+    O resultado é cacheado: cada template é analisado uma vez e
+    reutilizado em todos os leads da campanha.
+    """
+    parts = _PLACEHOLDER_RE.split(text)
+    segments: List[Tuple[str, Optional[str]]] = []
+    for i, part in enumerate(parts):
+        if i % 2 == 0:
+            if part:
+                segments.append((part, None))
+        else:
+            segments.append(('', part))
+    return tuple(segments)
+
+
+def _render_compiled(segments: Tuple[Tuple[str, Optional[str]], ...],
+                     variables: Dict) -> str:
+    """Renderiza segmentos já tokenizados com um único join"""
+    return ''.join(
+        literal if var is None else str(variables.get(var) or '')
+        for literal, var in segments
+    )
+
+
+def _render_segments(text: str, variables: Dict) -> str:
+    """Renderiza o template tokenizado com um único join"""
+    return _render_compiled(_compile_template(text), variables)
+
+
+# Templates fixos do settings tokenizados no load do módulo — o hot path
+# de envio nem paga o hash/lookup do lru_cache por email
+_COMPILED_TEMPLATES = {
+    name: (_compile_template(t['assunto']), _compile_template(t['corpo']))
+    for name, t in TEMPLATES.items()
+}
+
+# Campos exigidos por template (derivados da tokenização): permite
+# validar um contexto com set-diff em vez de capturar KeyError
+TEMPLATE_FIELDS = {
+    name: frozenset(
+        var for segs in (assunto, corpo) for _, var in segs if var is not None
+    )
+    for name, (assunto, corpo) in _COMPILED_TEMPLATES.items()
+}
+
+
+def render_template(template_name: str, variables: Dict) -> Tuple[str, str]:
+    """
+    Renderiza (assunto, corpo) de um template fixo com o contexto dado.
+
+    Args:
+        template_name: Nome do template em TEMPLATES
+        variables: Dict de variáveis de substituição
+
+    Returns:
+        Tuple[assunto, corpo] renderizados
+    """
+    assunto_segs, corpo_segs = _COMPILED_TEMPLATES.get(
+        template_name, _COMPILED_TEMPLATES['sem_decisor']
+    )
+    return (
+        _render_compiled(assunto_segs, variables),
+        _render_compiled(corpo_segs, variables),
+    )
+
 
 def get_template(template_name: str) -> Dict:
     """Retorna template por nome"""
@@ -29,9 +104,11 @@ def personalize_template(lead: Dict, template_name: str = None) -> Dict:
     """
     if template_name is None:
         template_name = get_template_type(lead)
-    
-    template = get_template(template_name)
-    
+
+    assunto_segs, corpo_segs = _COMPILED_TEMPLATES.get(
+        template_name, _COMPILED_TEMPLATES['sem_decisor']
+    )
+
     # Extrai dados para personalização
     decisor = lead.get('decisor', {})
     contatos = lead.get('contatos', {})
@@ -46,20 +123,11 @@ def personalize_template(lead: Dict, template_name: str = None) -> Dict:
         'site': lead.get('site', ''),
     }
     
-    # Substitui variáveis no assunto e corpo
-    assunto = template['assunto']
-    corpo = template['corpo']
-    
-    for key, value in variables.items():
-        placeholder = '{' + key + '}'
-        assunto = assunto.replace(placeholder, str(value) if value else '')
-        corpo = corpo.replace(placeholder, str(value) if value else '')
-    
-    # Limpa placeholders não substituídos
-    import re
-    assunto = re.sub(r'\{[^}]+\}', '', assunto)
-    corpo = re.sub(r'\{[^}]+\}', '', corpo)
-    
+    # Substitui variáveis no assunto e corpo em uma única passada.
+    # Placeholders sem valor correspondente viram string vazia.
+    assunto = _render_compiled(assunto_segs, variables)
+    corpo = _render_compiled(corpo_segs, variables)
+
     # Remove espaços extras
     assunto = ' '.join(assunto.split())
     
@@ -2,8 +2,12 @@
 Componentes visuais reutilizáveis para a interface Streamlit.
 Design System ABAplay.
 """
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
 import streamlit as st
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -102,6 +106,9 @@ CUSTOM_CSS = """
     border: 1px solid var(--gray-200);
     transition: transform 0.2s, box-shadow 0.2s;
     height: 100%;
+    /* Isola o reflow ao próprio card; o hover não relayouta os vizinhos */
+    contain: layout paint style;
+    will-change: transform;
 }
 
 .metric-card:hover {
@@ -180,7 +187,10 @@ CUSTOM_CSS = """
     border-radius: 0.75rem;
     padding: 1.25rem;
     margin: 0.75rem 0;
-    transition: all 0.2s;
+    /* Propriedades explícitas: animar "all" reativa layout em qualquer
+       mudança; border/box-shadow ficam no compositor */
+    transition: border-color 0.2s, box-shadow 0.2s;
+    contain: layout paint style;
 }
 
 .lead-card:hover {
@@ -305,6 +315,48 @@ CUSTOM_CSS = """
     color: var(--gray-700);
 }
 
+/* === STATUS BAR === */
+.status-bar {
+    display: flex;
+    gap: 8px;
+    margin-bottom: 0.5rem;
+}
+
+.status-pill {
+    display: flex;
+    flex: 1;
+    align-items: center;
+    gap: 6px;
+    padding: 8px 12px;
+    background: var(--gray-50);
+    border-radius: 8px;
+}
+
+.status-pill-icon {
+    width: 18px;
+    height: 18px;
+    border-radius: 50%;
+    color: white;
+    display: inline-flex;
+    align-items: center;
+    justify-content: center;
+    font-size: 10px;
+    font-weight: bold;
+}
+
+.status-pill.ok .status-pill-icon {
+    background: #48bb78;
+}
+
+.status-pill.warn .status-pill-icon {
+    background: #ecc94b;
+}
+
+.status-pill-label {
+    font-size: 13px;
+    color: var(--gray-700);
+}
+
 /* === PROGRESS TRACKER === */
 .progress-tracker {
     display: flex;
@@ -346,7 +398,8 @@ CUSTOM_CSS = """
     font-weight: 600;
     font-size: 0.85rem;
     color: var(--gray-500);
-    transition: all 0.3s;
+    transition: background 0.3s, border-color 0.3s, box-shadow 0.3s;
+    contain: layout paint style;
 }
 
 .progress-step.active .progress-step-circle {
@@ -415,23 +468,6 @@ CUSTOM_CSS = """
     }
 }
 
-/* Streamlit dark theme detection */
-[data-theme="dark"] .stTabs [data-baseweb="tab-list"],
-.stApp[data-theme="dark"] .stTabs [data-baseweb="tab-list"] {
-    background: #2d3748;
-}
-
-[data-theme="dark"] .stTabs [data-baseweb="tab"],
-.stApp[data-theme="dark"] .stTabs [data-baseweb="tab"] {
-    color: #e2e8f0 !important;
-}
-
-[data-theme="dark"] .stTabs [aria-selected="true"],
-.stApp[data-theme="dark"] .stTabs [aria-selected="true"] {
-    background: #4a5568 !important;
-    color: #ffffff !important;
-}
-
 /* === SIDEBAR (collapsed by default) === */
 section[data-testid="stSidebar"] {
     background: var(--gray-50);
@@ -452,16 +488,18 @@ section[data-testid="stSidebar"] {
     font-size: 0.85rem !important;
 }
 
-.dataframe tbody tr {
-    transition: background 0.15s;
-}
-
-.dataframe tbody tr:nth-child(even) {
-    background: var(--gray-50);
+/* Zebra via gradiente no tbody (pinta uma vez) em vez de
+   :nth-child(even), que força recálculo de estilo linha a linha */
+.dataframe tbody {
+    background-image: linear-gradient(transparent 50%, var(--gray-50) 50%);
+    background-size: 100% 4.75rem;
 }
 
+/* Hover é estado dinâmico por linha (não dá para pré-pintar como a
+   zebra); background-color em vez do shorthand background evita
+   resetar/invalidar as demais propriedades de background da linha */
 .dataframe tbody tr:hover {
-    background: var(--gray-100);
+    background-color: var(--gray-100);
 }
 
 .dataframe tbody td {
@@ -571,6 +609,24 @@ hr {
     border-radius: 0.25rem;
 }
 
+/* Card de skeleton em um único div: as barras são camadas de
+   background-image, sem a árvore de ~10 divs aninhados */
+.skeleton-card {
+    height: 7.5rem;
+    border: 1px solid var(--gray-200);
+    border-radius: 0.75rem;
+    margin: 0.75rem 0;
+    background-image:
+        linear-gradient(var(--gray-100), var(--gray-100)),
+        linear-gradient(var(--gray-100), var(--gray-100)),
+        linear-gradient(var(--gray-100), var(--gray-100)),
+        linear-gradient(var(--gray-100), var(--gray-100));
+    background-size: 200px 1.25rem, 120px 0.875rem, 180px 1rem, 140px 1rem;
+    background-position: 1.25rem 1.25rem, 1.25rem 3rem, 1.25rem 5rem, 15rem 5rem;
+    background-repeat: no-repeat;
+    animation: pulse 1.5s infinite;
+}
+
 @keyframes skeleton-loading {
     0% { background-position: 200% 0; }
     100% { background-position: -200% 0; }
@@ -613,9 +669,29 @@ hr {
 """
 
 
+@st.cache_resource
+def _css_payload() -> str:
+    """
+    Payload de CSS pronto para injeção, construído uma vez por processo.
+
+    Nota: a injeção em si precisa acontecer em todo rerun — o Streamlit
+    remove elementos que não são re-emitidos no script seguinte, então
+    condicionar o st.markdown a um flag de sessão deixaria a página sem
+    estilo a partir do segundo rerun. O que dá para amortizar é o lado
+    Python (montagem + minificação da string), feito aqui.
+    """
+    # Minifica: remove comentários, colapsa espaços e aperta pontuação.
+    # Como o payload vai ao browser em todo rerun, menos bytes = menos
+    # protobuf no fio e CSSOM mais rápido de construir.
+    css = re.sub(r"/\*.*?\*/", "", CUSTOM_CSS, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};:,>])\s*", r"\1", css)
+    return css.strip()
+
+
 def inject_custom_css():
     """Injeta o CSS customizado na página"""
-    st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+    st.markdown(_css_payload(), unsafe_allow_html=True)
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -655,6 +731,42 @@ def render_header(title: str = "ABAplay Email Automation",
     """, unsafe_allow_html=True)
 
 
+# Template montado uma vez no load do módulo; render_metric_card só
+# preenche as lacunas via format_map em vez de reconcatenar f-strings
+_METRIC_TMPL = (
+    '<div class="metric-card {variant}">'
+    '{icon_html}'
+    '<div class="metric-value">{value}</div>'
+    '<div class="metric-label">{label}</div>'
+    '{delta_html}'
+    '</div>'
+)
+
+
+def _metric_card_html(
+    value: str,
+    label: str,
+    icon: str = "",
+    variant: str = "default",
+    delta: Optional[str] = None,
+    delta_type: str = "positive"
+) -> str:
+    """Monta o HTML de um card de métrica (sem emitir elemento Streamlit)"""
+    delta_html = ""
+    if delta:
+        delta_html = f'<div class="metric-delta {delta_type}">{delta}</div>'
+
+    icon_html = f'<div class="metric-icon">{icon}</div>' if icon else ""
+
+    return _METRIC_TMPL.format_map({
+        'variant': variant,
+        'icon_html': icon_html,
+        'value': value,
+        'label': label,
+        'delta_html': delta_html,
+    })
+
+
 def render_metric_card(
     value: str,
     label: str,
@@ -674,124 +786,222 @@ def render_metric_card(
         delta: Valor de variação (opcional)
         delta_type: Tipo do delta (positive, negative)
     """
-    delta_html = ""
-    if delta:
-        delta_html = f'<div class="metric-delta {delta_type}">{delta}</div>'
+    st.markdown(
+        _metric_card_html(value, label, icon, variant, delta, delta_type),
+        unsafe_allow_html=True
+    )
 
-    icon_html = f'<div class="metric-icon">{icon}</div>' if icon else ""
 
-    st.markdown(f"""
-    <div class="metric-card {variant}">
-        {icon_html}
-        <div class="metric-value">{value}</div>
-        <div class="metric-label">{label}</div>
-        {delta_html}
-    </div>
-    """, unsafe_allow_html=True)
+def render_metrics_row(cards: List[Dict]):
+    """
+    Renderiza uma linha de cards de métrica em um único st.markdown.
 
+    Substitui st.columns + um render_metric_card por coluna: um grid CSS
+    com um elemento Streamlit no total, em vez de 2N+1.
 
-def render_lead_card(lead: Dict, show_details: bool = True):
+    Args:
+        cards: Lista de dicts com os kwargs de render_metric_card
+               (value, label, icon, variant, delta, delta_type)
     """
-    Renderiza card de lead estilizado usando componentes Streamlit nativos.
+    if not cards:
+        return
+    cards_html = "".join(_metric_card_html(**c) for c in cards)
+    st.markdown(
+        f'<div style="display:grid;grid-template-columns:repeat({len(cards)},1fr);gap:1rem;">'
+        f'{cards_html}</div>',
+        unsafe_allow_html=True
+    )
 
-    Args:
-        lead: Dados do lead
-        show_details: Se True, mostra detalhes expandidos
+
+# Lookups de cor/classe construídos uma vez no load do módulo.
+# Bucketing por soma de booleanos: (score>=40)+(score>=70) -> 0/1/2.
+_SCORE_CLASSES = ("low", "medium", "high")
+
+_COMPACT_METRIC_COLORS = {
+    "primary": ("var(--primary-500)", "rgba(102, 126, 234, 0.1)"),
+    "success": ("#48bb78", "var(--success-light)"),
+    "warning": ("#ecc94b", "var(--warning-light)"),
+    "error": ("#fc8181", "var(--error-light)"),
+}
+
+
+def _score_class(score: int) -> str:
+    """Classe de badge para o score sem branches encadeados"""
+    return _SCORE_CLASSES[(score >= 40) + (score >= 70)]
+
+
+@dataclass(frozen=True, slots=True)
+class LeadView:
+    """
+    Visão achatada de um lead para renderização.
+
+    Construída uma vez por lead, substitui as cadeias de
+    lead.get('x', {}).get('y') (e os dicts vazios descartáveis que elas
+    alocam) por acesso direto a atributos no loop de render. Por ser
+    frozen, também serve de chave de cache hashável.
+    """
+    nome: str
+    cidade: str
+    email: str
+    telefone: str
+    decisor_nome: str
+    decisor_cargo: str
+    score: int
+    confianca: str
+    tom: str
+    smtp_status: str
+
+    @classmethod
+    def from_lead(cls, lead: Dict) -> 'LeadView':
+        """Achata o dict de lead (aninhado ou plano) em um LeadView"""
+        contatos = lead.get('contatos') or {}
+        decisor = lead.get('decisor') or {}
+        contexto = lead.get('contexto_abordagem') or {}
+        return cls(
+            nome=lead.get('nome_clinica', 'N/A'),
+            cidade=lead.get('cidade_uf', 'N/A'),
+            email=contatos.get('email_principal') or lead.get('email_principal', 'N/A'),
+            telefone=contatos.get('telefone') or lead.get('telefone', ''),
+            decisor_nome=decisor.get('nome') or lead.get('decisor_nome', ''),
+            decisor_cargo=decisor.get('cargo') or lead.get('decisor_cargo', ''),
+            score=lead.get('score', 50),
+            confianca=lead.get('confianca', 'media'),
+            tom=contexto.get('tom_sugerido') or lead.get('tom_sugerido', ''),
+            smtp_status=lead.get('smtp_status', ''),
+        )
+
+
+def _lead_signature(lead: Union[Dict, LeadView], show_details: bool) -> tuple:
+    """Assinatura hashável de um lead para a chave do cache de HTML"""
+    view = lead if isinstance(lead, LeadView) else LeadView.from_lead(lead)
+    return (
+        view.nome, view.cidade, view.email, view.telefone,
+        view.decisor_nome, view.decisor_cargo, view.score,
+        view.confianca, view.tom, view.smtp_status,
+        show_details,
+    )
+
+
+@lru_cache(maxsize=4096)
+def _lead_card_html_cached(sig: tuple) -> str:
+    """
+    Monta o HTML de um card de lead a partir da assinatura (memoizado).
+
+    Em reruns do Streamlit a lista de leads quase nunca muda — cachear
+    por assinatura transforma a remontagem da string em lookup.
     """
-    nome = lead.get('nome_clinica', 'N/A')
-    cidade = lead.get('cidade_uf', 'N/A')
-    email = lead.get('contatos', {}).get('email_principal') or lead.get('email_principal', 'N/A')
-    telefone = lead.get('contatos', {}).get('telefone') or lead.get('telefone', '')
-    decisor_nome = lead.get('decisor', {}).get('nome') or lead.get('decisor_nome', '')
-    decisor_cargo = lead.get('decisor', {}).get('cargo') or lead.get('decisor_cargo', '')
-    score = lead.get('score', 50)
-    confianca = lead.get('confianca', 'media')
-    tom = lead.get('contexto_abordagem', {}).get('tom_sugerido') or lead.get('tom_sugerido', '')
-
-    # Cores para badges
-    score_color = "#48bb78" if score >= 70 else "#ecc94b" if score >= 40 else "#fc8181"
-    confianca_colors = {"alta": "#48bb78", "media": "#ecc94b", "baixa": "#fc8181"}
-    confianca_bg = confianca_colors.get(confianca.lower() if confianca else "media", "#ecc94b")
+    (nome, cidade, email, telefone, decisor_nome, decisor_cargo,
+     score, confianca, tom, smtp_status, show_details) = sig
+
+    # Classes de badge (definidas em CUSTOM_CSS)
+    score_class = _score_class(score)
+    confianca_class = (confianca or "media").lower()
+
+    badges = [
+        f'<span class="badge badge-score {score_class}">{score}</span>',
+        f'<span class="badge badge-confianca {confianca_class}">{confianca_class.upper()}</span>',
+    ]
 
     # Badge de verificação SMTP
-    smtp_status = lead.get('smtp_status', '')
-    smtp_badge = ''
     if smtp_status == 'valid':
-        smtp_badge = '<span style="background:#38a169;color:white;padding:2px 8px;border-radius:12px;font-size:11px;font-weight:600;" title="E-mail verificado via SMTP">✓ SMTP</span>'
+        badges.append('<span style="background:#38a169;color:white;padding:2px 8px;border-radius:12px;font-size:11px;font-weight:600;" title="E-mail verificado via SMTP">✓ SMTP</span>')
     elif smtp_status == 'catch_all':
-        smtp_badge = '<span style="background:#dd6b20;color:white;padding:2px 8px;border-radius:12px;font-size:11px;font-weight:600;" title="Domínio catch-all, não verificável">⚠ CATCH-ALL</span>'
+        badges.append('<span style="background:#dd6b20;color:white;padding:2px 8px;border-radius:12px;font-size:11px;font-weight:600;" title="Domínio catch-all, não verificável">⚠ CATCH-ALL</span>')
     elif smtp_status == 'unknown':
-        smtp_badge = '<span style="background:#a0aec0;color:white;padding:2px 8px;border-radius:12px;font-size:11px;font-weight:600;" title="Não foi possível verificar">? N/V</span>'
-
-    # Container do card
-    with st.container():
-        # Header com nome e badges
-        col_info, col_badges = st.columns([3, 1])
-
-        with col_info:
-            st.markdown(f"**{nome}**")
-            st.caption(f"📍 {cidade}")
-
-        with col_badges:
-            badges_html = (
-                f'<div style="display:flex;gap:4px;flex-wrap:wrap;justify-content:flex-end;">'
-                f'<span style="background:{score_color};color:white;padding:2px 8px;border-radius:12px;font-size:11px;font-weight:600;">{score}</span>'
-                f'<span style="background:{confianca_bg};color:white;padding:2px 8px;border-radius:12px;font-size:11px;font-weight:600;">{(confianca or "media").upper()}</span>'
-            )
-            if smtp_badge:
-                badges_html += smtp_badge
-            if tom:
-                badges_html += f'<span style="background:#e2e8f0;color:#4a5568;padding:2px 8px;border-radius:12px;font-size:11px;">{tom}</span>'
-            badges_html += '</div>'
-            st.markdown(badges_html, unsafe_allow_html=True)
-
-        # Detalhes
-        if show_details:
-            detail_cols = st.columns(4)
-            with detail_cols[0]:
-                st.caption(f"📧 {email}")
-            with detail_cols[1]:
-                st.caption(f"📞 {telefone or 'N/A'}")
-            with detail_cols[2]:
-                st.caption(f"👤 {decisor_nome or 'N/A'}")
-            with detail_cols[3]:
-                st.caption(f"💼 {decisor_cargo or 'N/A'}")
-
-        st.divider()
+        badges.append('<span style="background:#a0aec0;color:white;padding:2px 8px;border-radius:12px;font-size:11px;font-weight:600;" title="Não foi possível verificar">? N/V</span>')
+
+    if tom:
+        badges.append(f'<span class="badge badge-tom">{tom}</span>')
+
+    details_html = ""
+    if show_details:
+        details_html = (
+            '<div class="lead-details">'
+            f'<div class="lead-detail-item">📧 {email}</div>'
+            f'<div class="lead-detail-item">📞 {telefone or "N/A"}</div>'
+            f'<div class="lead-detail-item">👤 {decisor_nome or "N/A"}</div>'
+            f'<div class="lead-detail-item">💼 {decisor_cargo or "N/A"}</div>'
+            '</div>'
+        )
+
+    return (
+        '<div class="lead-card">'
+        '<div class="lead-card-header">'
+        '<div>'
+        f'<p class="lead-name">{nome}</p>'
+        f'<div class="lead-location">📍 {cidade}</div>'
+        '</div>'
+        f'<div class="lead-badges">{"".join(badges)}</div>'
+        '</div>'
+        f'{details_html}'
+        '</div>'
+    )
+
+
+def _lead_card_html(lead: Union[Dict, LeadView], show_details: bool = True) -> str:
+    """Monta o HTML de um card de lead (sem emitir elemento Streamlit)"""
+    return _lead_card_html_cached(_lead_signature(lead, show_details))
+
+
+def render_lead_card(lead: Union[Dict, LeadView], show_details: bool = True):
+    """
+    Renderiza card de lead estilizado.
+
+    Um único st.markdown por card (em vez de ~10 elementos Streamlit).
+
+    Args:
+        lead: Dados do lead
+        show_details: Se True, mostra detalhes expandidos
+    """
+    st.markdown(_lead_card_html(lead, show_details), unsafe_allow_html=True)
+
+
+def render_lead_cards(leads: List[Union[Dict, LeadView]], show_details: bool = True):
+    """
+    Renderiza uma lista de cards em um único st.markdown.
+
+    Amortiza a reconciliação do frontend sobre a lista inteira em vez
+    de pagar um elemento Streamlit por lead.
+    """
+    if not leads:
+        return
+    st.markdown(
+        "".join(_lead_card_html(lead, show_details) for lead in leads),
+        unsafe_allow_html=True
+    )
 
 
 def render_progress_tracker(current_step: int, steps: List[str]):
     """
-    Renderiza tracker de progresso visual usando componentes Streamlit nativos.
+    Renderiza tracker de progresso visual em um único st.markdown.
+
+    Usa as classes .progress-tracker/.progress-step do CUSTOM_CSS em
+    vez de N colunas + N markdowns por rerun.
 
     Args:
         current_step: Índice do passo atual (0-based)
         steps: Lista de labels dos passos
     """
-    cols = st.columns(len(steps))
-
-    for i, (col, step) in enumerate(zip(cols, steps)):
-        with col:
-            if i < current_step:
-                # Completed
-                color = "#48bb78"
-                icon = "✓"
-            elif i == current_step:
-                # Active
-                color = "#667eea"
-                icon = str(i + 1)
-            else:
-                # Pending
-                color = "#cbd5e0"
-                icon = str(i + 1)
-
-            st.markdown(
-                f'<div style="text-align:center;">'
-                f'<div style="width:32px;height:32px;border-radius:50%;background:{color};color:white;display:inline-flex;align-items:center;justify-content:center;font-weight:600;font-size:14px;margin-bottom:4px;">{icon}</div>'
-                f'<div style="font-size:11px;color:#718096;">{step}</div>'
-                f'</div>',
-                unsafe_allow_html=True
-            )
+    steps_html = []
+    for i, step in enumerate(steps):
+        if i < current_step:
+            cls, icon = "completed", "✓"
+        elif i == current_step:
+            cls, icon = "active", str(i + 1)
+        else:
+            cls, icon = "", str(i + 1)
+
+        steps_html.append(
+            f'<div class="progress-step {cls}">'
+            f'<div class="progress-step-circle">{icon}</div>'
+            f'<div class="progress-step-label">{step}</div>'
+            f'</div>'
+        )
+
+    st.markdown(
+        f'<div class="progress-tracker">{"".join(steps_html)}</div>',
+        unsafe_allow_html=True
+    )
 
 
 def render_status_badge(status: str) -> str:
@@ -808,27 +1018,13 @@ def render_status_badge(status: str) -> str:
 
 
 def render_skeleton_card():
-    """Renderiza skeleton loading para cards"""
-    st.markdown("""
-    <div class="lead-card">
-        <div class="lead-card-header">
-            <div>
-                <div class="skeleton" style="height: 1.25rem; width: 200px; margin-bottom: 0.5rem;"></div>
-                <div class="skeleton" style="height: 0.875rem; width: 120px;"></div>
-            </div>
-            <div style="display: flex; gap: 0.375rem;">
-                <div class="skeleton" style="height: 1.5rem; width: 40px; border-radius: 9999px;"></div>
-                <div class="skeleton" style="height: 1.5rem; width: 50px; border-radius: 9999px;"></div>
-            </div>
-        </div>
-        <div class="lead-details">
-            <div class="skeleton" style="height: 1rem; width: 180px;"></div>
-            <div class="skeleton" style="height: 1rem; width: 120px;"></div>
-            <div class="skeleton" style="height: 1rem; width: 140px;"></div>
-            <div class="skeleton" style="height: 1rem; width: 100px;"></div>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+    """
+    Renderiza skeleton loading para cards.
+
+    Um único div: as barras são camadas de background da classe
+    .skeleton-card, sem os ~10 divs animados da versão anterior.
+    """
+    st.markdown('<div class="skeleton-card"></div>', unsafe_allow_html=True)
 
 
 def render_empty_state(message: str, icon: str = "📭"):
@@ -924,13 +1120,9 @@ def render_compact_metric(value: str, label: str, icon: str = "", color: str = "
         icon: Ícone opcional
         color: Cor (primary, success, warning, error)
     """
-    colors = {
-        "primary": ("var(--primary-500)", "rgba(102, 126, 234, 0.1)"),
-        "success": ("#48bb78", "var(--success-light)"),
-        "warning": ("#ecc94b", "var(--warning-light)"),
-        "error": ("#fc8181", "var(--error-light)")
-    }
-    text_color, bg_color = colors.get(color, colors["primary"])
+    text_color, bg_color = _COMPACT_METRIC_COLORS.get(
+        color, _COMPACT_METRIC_COLORS["primary"]
+    )
 
     st.markdown(f"""
     <div style="display: flex; align-items: center; gap: 0.5rem; padding: 0.5rem 1rem; background: {bg_color}; border-radius: 0.5rem; border-left: 3px solid {text_color};">
@@ -945,25 +1137,27 @@ def render_compact_metric(value: str, label: str, icon: str = "", color: str = "
 
 def render_status_bar(statuses: List[Dict]):
     """
-    Renderiza barra de status horizontal usando componentes Streamlit nativos.
+    Renderiza barra de status horizontal em um único st.markdown.
+
+    Flex container com a classe .status-pill do CUSTOM_CSS no lugar de
+    st.columns(len(statuses)) + um markdown por coluna.
 
     Args:
         statuses: Lista de dicts com {label, status (bool), message (optional)}
     """
-    # Adiciona espaçamento vertical
-    st.markdown('<div style="margin-bottom: 0.5rem;"></div>', unsafe_allow_html=True)
-
-    cols = st.columns(len(statuses))
-    for col, s in zip(cols, statuses):
+    pills = []
+    for s in statuses:
         status_ok = s.get('status', False)
-        color = "#48bb78" if status_ok else "#ecc94b"
+        cls = "ok" if status_ok else "warn"
         icon = "✓" if status_ok else "⚠"
-        label = s.get('label', '')
-        with col:
-            st.markdown(
-                f'<div style="display:flex;align-items:center;gap:6px;padding:8px 12px;background:#f7fafc;border-radius:8px;">'
-                f'<span style="width:18px;height:18px;border-radius:50%;background:{color};color:white;display:inline-flex;align-items:center;justify-content:center;font-size:10px;font-weight:bold;">{icon}</span>'
-                f'<span style="font-size:13px;color:#4a5568;">{label}</span>'
-                f'</div>',
-                unsafe_allow_html=True
-            )
+        pills.append(
+            f'<div class="status-pill {cls}">'
+            f'<span class="status-pill-icon">{icon}</span>'
+            f'<span class="status-pill-label">{s.get("label", "")}</span>'
+            f'</div>'
+        )
+
+    st.markdown(
+        f'<div class="status-bar">{"".join(pills)}</div>',
+        unsafe_allow_html=True
+    )
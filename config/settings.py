@@ -2,21 +2,66 @@
 Configurações centralizadas do sistema de automação de emails ABAplay
 """
 import os
+import re
+import sys
+from functools import lru_cache
 from pathlib import Path
-from dotenv import load_dotenv
+from types import MappingProxyType
+
+# Carrega variáveis de ambiente — uma vez por processo, com import
+# adiado e pulado em ambientes gerenciados (Streamlit Cloud / Render),
+# onde as variáveis já vêm populadas e o parse do .env é só IO morto.
+# Se existir o snapshot compilado (scripts/compile_dotenv.py), o load é
+# um import de bytecode em vez do parser do dotenv.
+_DOTENV_LOADED = globals().get("_DOTENV_LOADED", False)
+if not _DOTENV_LOADED and not (
+    os.getenv("STREAMLIT_RUNTIME_ENV")
+    or os.getenv("STREAMLIT_RUNTIME")
+    or os.getenv("RENDER")
+):
+    try:
+        from config._env_compiled import VALUES as _env_values
+        for _k, _v in _env_values.items():
+            os.environ.setdefault(_k, _v)
+    except ImportError:
+        from dotenv import load_dotenv
+        load_dotenv()
+    _DOTENV_LOADED = True
 
-# Carrega variáveis de ambiente
-load_dotenv()
 
+@lru_cache(maxsize=1)
+def _streamlit_secrets():
+    """
+    Resolve st.secrets uma única vez por processo (None se indisponível).
 
-def _get_secret(key: str, default: str = "") -> str:
-    """Busca secret do Streamlit ou .env"""
+    Evita repetir o import + try/except do streamlit a cada chave lida;
+    scripts CLI que nunca importaram o framework não pagam o import.
+    """
+    if "streamlit" not in sys.modules:
+        return None
     try:
         import streamlit as st
-        if key in st.secrets:
-            return st.secrets[key]
+        return st.secrets
     except Exception:
-        pass
+        return None
+
+
+@lru_cache(maxsize=None)
+def _get_secret(key: str, default: str = "") -> str:
+    """
+    Busca secret do Streamlit ou .env (memoizado por chave).
+
+    Secrets não mudam durante a vida do processo; o cache evita re-sondar
+    o mapping TOML de st.secrets + os.getenv a cada rerun.
+    """
+    secrets = _streamlit_secrets()
+    if secrets is not None:
+        try:
+            value = secrets.get(key)
+            if value is not None:
+                return value
+        except Exception:
+            pass
     return os.getenv(key, default)
 
 
@@ -33,7 +78,12 @@ MAX_ATTEMPTS_PER_LEAD = 2  # Máximo de tentativas por lead
 # === Schedule ===
 WORK_HOURS_START = 9   # 09:00
 WORK_HOURS_END = 18    # 18:00
-WORK_DAYS = [0, 1, 2, 3, 4]  # Segunda a Sexta (0=Monday)
+WORK_DAYS = (0, 1, 2, 3, 4)  # Segunda a Sexta (0=Monday)
+
+# Variantes O(1) para checagem de dia útil em loops:
+# `weekday in WORK_DAYS_SET` ou o teste de bit `WORK_DAY_MASK >> weekday & 1`
+WORK_DAYS_SET = frozenset(WORK_DAYS)
+WORK_DAY_MASK = sum(1 << d for d in WORK_DAYS)
 
 # === Delay Configuration (seconds) ===
 DELAY_MEAN = 90        # Média do delay gaussiano
@@ -46,7 +96,10 @@ DELAY_BATCH_EXTRA_MAX = 600   # 10 min extras a cada batch
 # === Paths ===
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / "data"
-DESKTOP_PATH = Path(os.getenv("DESKTOP_PATH", Path.home() / "Área de Trabalho"))
+# Short-circuit: só resolve Path.home() (syscall getpwuid) quando a
+# variável de ambiente não define o destino
+_desktop_env = os.getenv("DESKTOP_PATH")
+DESKTOP_PATH = Path(_desktop_env) if _desktop_env else Path.home() / "Área de Trabalho"
 
 # === Gemini Configuration ===
 GEMINI_API_KEY = _get_secret("GEMINI_API_KEY", "")
@@ -70,17 +123,19 @@ GOOGLE_SHEETS_CREDENTIALS_PATH = _get_secret("GOOGLE_SHEETS_CREDENTIALS_PATH", "
 
 # === Lead Scoring Weights ===
 SCORE_EMAIL_EXISTS = 30
-SCORE_EMAIL_TYPE = {
+# MappingProxyType: leitura idêntica a dict, mas imutável — seguro para
+# compartilhar com workers sem risco de mutação acidental
+SCORE_EMAIL_TYPE = MappingProxyType({
     'nominal': 25,    # secretariadraflaviana@gmail.com
     'cargo': 20,      # diretoria@clinica.com
     'generico': 10,   # contato@clinica.com
     'form_only': 0    # Sem email
-}
-SCORE_CONFIDENCE = {
+})
+SCORE_CONFIDENCE = MappingProxyType({
     'alta': 25,
     'media': 15,
     'baixa': 5
-}
+})
 SCORE_DECISOR_IDENTIFIED = 10
 SCORE_HAS_WEBSITE = 10
 
@@ -129,7 +184,23 @@ Responda REMOVER para sair da lista.
 }
 
 # === Unsubscribe ===
-UNSUBSCRIBE_KEYWORDS = ['remover', 'unsubscribe', 'descadastrar', 'não quero', 'pare']
+UNSUBSCRIBE_KEYWORDS = ('remover', 'unsubscribe', 'descadastrar', 'não quero', 'pare')
+
+# Para lookups exatos O(1) (a regex abaixo cobre busca em texto livre)
+UNSUBSCRIBE_KEYWORDS_SET = frozenset(UNSUBSCRIBE_KEYWORDS)
+
+# Regex compilada uma vez: uma passada no texto em vez de um scan de
+# substring por keyword. Os \b evitam falsos positivos em palavras
+# maiores (ex.: "pare" dentro de "comparecer").
+UNSUBSCRIBE_RE = re.compile(
+    r"\b(?:" + "|".join(map(re.escape, UNSUBSCRIBE_KEYWORDS)) + r")\b",
+    re.IGNORECASE
+)
+
+
+def is_unsubscribe(text: str) -> bool:
+    """Detecta pedido de descadastro em uma única passada no texto"""
+    return bool(text) and UNSUBSCRIBE_RE.search(text) is not None
 
 # === Timeouts ===
 LLM_TIMEOUT_SECONDS = 60  # Timeout para processamento de leads
@@ -151,30 +222,40 @@ class ConfigurationError(Exception):
     pass
 
 
-def validate_config() -> list:
-    """
-    Valida configurações obrigatórias.
-
-    Returns:
-        Lista de erros (vazia se tudo OK)
-    """
+@lru_cache(maxsize=1)
+def _validate_config_cached(resend_key: str, sender_email: str,
+                            database_url: str) -> tuple:
+    """Validação propriamente dita, cacheada pela assinatura dos valores"""
     errors = []
 
     # Verifica API keys obrigatórias
-    if not RESEND_API_KEY:
+    if not resend_key:
         errors.append("RESEND_API_KEY não configurada no .env")
 
-    if not SENDER_EMAIL:
+    if not sender_email:
         errors.append("SENDER_EMAIL não configurado no .env")
 
-    if not DATABASE_URL:
+    if not database_url:
         errors.append("DATABASE_URL não configurada no .env")
 
     # Verifica formato da API key do Resend
-    if RESEND_API_KEY and not RESEND_API_KEY.startswith('re_'):
+    if resend_key and not resend_key.startswith('re_'):
         errors.append("RESEND_API_KEY com formato inválido (deve começar com 're_')")
 
-    return errors
+    return tuple(errors)
+
+
+def validate_config() -> list:
+    """
+    Valida configurações obrigatórias.
+
+    O resultado é cacheado pela tupla de valores validados — em reruns
+    do Streamlit a revalidação vira um lookup.
+
+    Returns:
+        Lista de erros (vazia se tudo OK)
+    """
+    return list(_validate_config_cached(RESEND_API_KEY, SENDER_EMAIL, DATABASE_URL))
 
 
 def get_config_status() -> dict:
@@ -1,12 +1,12 @@
 """
-Script para adicionar leads manualmente na planilha com dados completos.
+Script para adicionar leads manualmente no banco com dados completos.
 Útil para corrigir leads que não foram registrados ou importar leads externos.
 
 Uso:
     # Como módulo
-    from scripts.add_leads import add_leads_to_sheet
+    from scripts.add_leads import add_leads
     leads = [{"nome_clinica": "...", "contatos": {...}, ...}]
-    add_leads_to_sheet(leads, campaign_id="minha_campanha")
+    add_leads(leads, campaign_id="minha_campanha")
 
     # Como script (edite LEADS_DATA abaixo)
     python scripts/add_leads.py
@@ -15,63 +15,39 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from typing import List, Dict, Optional
-from app.database import get_worksheet, SHEET_COLUMNS, _generate_id, _now_iso
-import json
+from typing import List, Dict
+from app.database import get_cursor, insert_leads_bulk
 
+try:
+    import orjson as _json_parser
+except ImportError:
+    import json as _json_parser
 
-def lead_to_row(lead: Dict, campaign_id: str) -> List:
-    """
-    Converte um lead do formato JSON para formato de linha da planilha.
 
-    Args:
-        lead: Dicionário com dados do lead no formato padrão
-        campaign_id: ID da campanha associada
+def _existing_lead_emails() -> set:
+    """Busca (uma vez) os emails já registrados na tabela de leads"""
+    with get_cursor() as cur:
+        cur.execute("""
+            SELECT DISTINCT LOWER(email_principal) AS email
+            FROM leads
+            WHERE email_principal IS NOT NULL AND email_principal != ''
+        """)
+        return {row['email'] for row in cur.fetchall()}
 
-    Returns:
-        Lista com valores na ordem das colunas da planilha
-    """
-    contexto = lead.get('contexto_abordagem', {})
-    contatos = lead.get('contatos', {})
-    decisor = lead.get('decisor', {})
-
-    return [
-        _generate_id(),                              # id
-        campaign_id,                                 # campaign_id
-        lead.get('nome_clinica', ''),               # nome_clinica
-        lead.get('endereco', ''),                   # endereco
-        lead.get('cidade_uf', ''),                  # cidade_uf
-        lead.get('cnpj', ''),                       # cnpj
-        lead.get('site', ''),                       # site
-        decisor.get('nome', ''),                    # decisor_nome
-        decisor.get('cargo', ''),                   # decisor_cargo
-        decisor.get('linkedin', ''),                # decisor_linkedin
-        contatos.get('email_principal', ''),        # email_principal
-        contatos.get('email_tipo', ''),             # email_tipo
-        contatos.get('telefone', ''),               # telefone
-        contatos.get('whatsapp', ''),               # whatsapp
-        contatos.get('instagram', ''),              # instagram
-        lead.get('fonte', ''),                      # fonte
-        lead.get('confianca', ''),                  # confianca
-        lead.get('score', 0),                       # score
-        contexto.get('resumo_clinica', ''),         # resumo_clinica
-        contexto.get('perfil_decisor', ''),         # perfil_decisor
-        contexto.get('gancho_personalizacao', ''),  # gancho_personalizacao
-        contexto.get('dor_provavel', ''),           # dor_provavel
-        contexto.get('tom_sugerido', ''),           # tom_sugerido
-        json.dumps(lead, ensure_ascii=False),       # raw_data
-        _now_iso()                                  # created_at
-    ]
-
-
-def add_leads_to_sheet(
+
+def add_leads(
     leads: List[Dict],
     campaign_id: str = "manual_import",
     skip_existing: bool = True,
     verbose: bool = True
 ) -> Dict:
     """
-    Adiciona uma lista de leads na planilha.
+    Adiciona uma lista de leads no banco em lote.
+
+    A checagem de existentes é uma única query e a escrita um único
+    insert_leads_bulk — duas idas ao banco no total, independente do
+    tamanho do lote (a versão antiga da planilha fazia 2 chamadas de
+    API por lead).
 
     Args:
         leads: Lista de dicionários com dados dos leads
@@ -85,22 +61,13 @@ def add_leads_to_sheet(
     if verbose:
         print(f"🔄 Adicionando {len(leads)} leads...")
 
-    ws = get_worksheet('leads', fresh=True)
+    existing_emails = _existing_lead_emails() if skip_existing else set()
 
-    # Verifica leads já existentes (por email)
-    existing_emails = set()
-    if skip_existing:
-        existing_rows = ws.get_all_values()
-        if len(existing_rows) > 1:
-            email_col = SHEET_COLUMNS['leads'].index('email_principal')
-            for row in existing_rows[1:]:
-                if len(row) > email_col and row[email_col]:
-                    existing_emails.add(row[email_col].lower())
-
-    if verbose:
+    if verbose and skip_existing:
         print(f"📋 Leads já registrados: {len(existing_emails)}")
 
     stats = {"added": 0, "skipped": 0, "no_email": 0, "errors": 0}
+    to_insert = []
 
     for lead in leads:
         email = lead.get('contatos', {}).get('email_principal', '')
@@ -112,31 +79,31 @@ def add_leads_to_sheet(
             stats["no_email"] += 1
             continue
 
-        if skip_existing and email.lower() in existing_emails:
+        # Normaliza uma vez por lead (lower e não casefold, para casar
+        # com o LOWER() do Postgres usado na query de existentes)
+        email_lc = email.lower()
+
+        if skip_existing and email_lc in existing_emails:
             if verbose:
                 print(f"⏭️  Já existe: {nome} ({email})")
             stats["skipped"] += 1
             continue
 
-        try:
-            row = lead_to_row(lead, campaign_id)
-
-            # Usa insert_row em posição específica para evitar race condition
-            all_values = ws.get_all_values()
-            next_row = len(all_values) + 1
-            ws.insert_row(row, next_row)
+        to_insert.append(lead)
+        # Evita duplicatas dentro do próprio lote
+        existing_emails.add(email_lc)
 
+    if to_insert:
+        try:
+            insert_leads_bulk(campaign_id, to_insert)
+            stats["added"] = len(to_insert)
             if verbose:
-                print(f"✅ Adicionado: {nome} ({email})")
-            stats["added"] += 1
-
-            # Atualiza set de emails existentes para evitar duplicatas no mesmo lote
-            existing_emails.add(email.lower())
-
+                for lead in to_insert:
+                    print(f"✅ Adicionado: {lead.get('nome_clinica', 'Desconhecido')}")
         except Exception as e:
             if verbose:
-                print(f"❌ Erro em {nome}: {e}")
-            stats["errors"] += 1
+                print(f"❌ Erro no lote: {e}")
+            stats["errors"] = len(to_insert)
 
     if verbose:
         print(f"\n📊 Resumo:")
@@ -149,6 +116,10 @@ def add_leads_to_sheet(
     return stats
 
 
+# Alias mantido para o uso documentado antes da migração da planilha
+add_leads_to_sheet = add_leads
+
+
 def add_leads_from_json(json_data: str, campaign_id: str = "manual_import") -> Dict:
     """
     Adiciona leads a partir de uma string JSON.
@@ -160,7 +131,7 @@ def add_leads_from_json(json_data: str, campaign_id: str = "manual_import") -> D
     Returns:
         Estatísticas da operação
     """
-    data = json.loads(json_data)
+    data = _json_parser.loads(json_data)
 
     if isinstance(data, list):
         leads = data
@@ -169,7 +140,7 @@ def add_leads_from_json(json_data: str, campaign_id: str = "manual_import") -> D
     else:
         raise ValueError("JSON deve ser uma lista ou objeto com chave 'leads'")
 
-    return add_leads_to_sheet(leads, campaign_id)
+    return add_leads(leads, campaign_id)
 
 
 # =============================================================================
@@ -213,6 +184,6 @@ if __name__ == "__main__":
     if not LEADS_DATA:
         print("ℹ️  Nenhum lead definido em LEADS_DATA.")
         print("   Edite o arquivo e adicione os leads, ou use como módulo:")
-        print("   from scripts.add_leads import add_leads_to_sheet")
+        print("   from scripts.add_leads import add_leads")
     else:
-        add_leads_to_sheet(LEADS_DATA, campaign_id="manual_import")
+        add_leads(LEADS_DATA, campaign_id="manual_import")
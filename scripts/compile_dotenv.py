@@ -0,0 +1,55 @@
+"""
+Compila o .env em um módulo Python (config/_env_compiled.py).
+
+Em cold start o settings.py importa o snapshot compilado — um load de
+bytecode via __pycache__ — em vez de pagar o parser linha a linha do
+dotenv a cada processo. Rode no deploy, depois de alterar o .env:
+
+    python scripts/compile_dotenv.py
+
+O arquivo gerado contém secrets: mantenha-o fora do controle de versão
+(mesma política do próprio .env).
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dotenv import dotenv_values
+
+BASE_DIR = Path(__file__).parent.parent
+ENV_PATH = BASE_DIR / ".env"
+OUTPUT_PATH = BASE_DIR / "config" / "_env_compiled.py"
+
+
+def compile_dotenv(env_path: Path = ENV_PATH, output_path: Path = OUTPUT_PATH) -> int:
+    """
+    Gera o snapshot compilado do .env.
+
+    Returns:
+        Número de variáveis escritas
+    """
+    if not env_path.exists():
+        print(f"[ERRO] {env_path} não encontrado")
+        return 0
+
+    values = {k: v for k, v in dotenv_values(env_path).items() if v is not None}
+
+    lines = [
+        '"""',
+        'Snapshot do .env gerado por scripts/compile_dotenv.py — NÃO EDITAR.',
+        'Contém secrets: manter fora do controle de versão.',
+        '"""',
+        'VALUES = {',
+    ]
+    for key, value in values.items():
+        lines.append(f'    {key!r}: {value!r},')
+    lines.append('}')
+    lines.append('')
+
+    output_path.write_text('\n'.join(lines), encoding='utf-8')
+    print(f"[OK] {len(values)} variáveis compiladas em {output_path}")
+    return len(values)
+
+
+if __name__ == '__main__':
+    compile_dotenv()
@@ -4,29 +4,56 @@ Importa as tabelas restantes: email_log (575 faltando), blacklist, settings.
 Usa queries parametrizadas + ON CONFLICT DO NOTHING (seguro para re-execução).
 """
 import psycopg2
-from psycopg2.extras import RealDictCursor, execute_values
+from psycopg2.extras import execute_values
+from itertools import islice
 import sys
 
 import os
 NEON_URL = os.environ["NEON_DATABASE_URL"]
 RENDER_URL = os.environ["RENDER_DATABASE_URL"]
 
-def migrate_email_log(neon_cur, render_cur):
+# Keepalives TCP: migrações longas não perdem a conexão ociosa no meio
+# (redial paga handshake TLS de novo)
+_CONNECT_KWARGS = dict(
+    connect_timeout=15,
+    keepalives=1,
+    keepalives_idle=30,
+    keepalives_interval=10,
+    keepalives_count=3,
+)
+
+# Commit a cada N linhas no streaming: limita o WAL pendente no destino
+COMMIT_CHUNK = 5000
+
+def migrate_email_log(neon, render, render_cur):
+    # Cursor nomeado = server-side: o Neon entrega blocos de itersize
+    # linhas e o execute_values consome o iterador direto, sem o pico de
+    # memória do fetchall + lista intermediária. Cursor de tuplas: o
+    # SELECT já vem na ordem do INSERT, então não há remapeamento por
+    # linha (nem o dict descartável do RealDictCursor).
+    neon_cur = neon.cursor('migrate_email_log')
+    neon_cur.itersize = 1000
     neon_cur.execute("SELECT id, lead_id, campaign_id, email_to, subject, body_html, status, attempt_number, resend_id, error_message, sent_at, created_at FROM email_log")
-    rows = neon_cur.fetchall()
-    data = [(r['id'], r['lead_id'], r['campaign_id'], r['email_to'], r['subject'], r['body_html'],
-             r['status'], r['attempt_number'], r['resend_id'], r['error_message'], r['sent_at'], r['created_at'])
-            for r in rows]
-    execute_values(render_cur, """
-        INSERT INTO sdr.email_log (id, lead_id, campaign_id, email_to, subject, body_html, status, attempt_number, resend_id, error_message, sent_at, created_at)
-        VALUES %s ON CONFLICT (id) DO NOTHING
-    """, data, page_size=50)
-    return len(data)
+    count = 0
+
+    rows = iter(neon_cur)
+    while True:
+        chunk = list(islice(rows, COMMIT_CHUNK))
+        if not chunk:
+            break
+        execute_values(render_cur, """
+            INSERT INTO sdr.email_log (id, lead_id, campaign_id, email_to, subject, body_html, status, attempt_number, resend_id, error_message, sent_at, created_at)
+            VALUES %s ON CONFLICT (id) DO NOTHING
+        """, chunk, page_size=500)
+        render.commit()
+        count += len(chunk)
+
+    neon_cur.close()
+    return count
 
 def migrate_blacklist(neon_cur, render_cur):
     neon_cur.execute("SELECT id, email, reason, source_campaign_id, added_at FROM blacklist")
-    rows = neon_cur.fetchall()
-    data = [(r['id'], r['email'], r['reason'], r['source_campaign_id'], r['added_at']) for r in rows]
+    data = neon_cur.fetchall()
     execute_values(render_cur, """
         INSERT INTO sdr.blacklist (id, email, reason, source_campaign_id, added_at)
         VALUES %s ON CONFLICT (id) DO NOTHING
@@ -35,8 +62,7 @@ def migrate_blacklist(neon_cur, render_cur):
 
 def migrate_settings(neon_cur, render_cur):
     neon_cur.execute("SELECT key, value, description, updated_at FROM settings")
-    rows = neon_cur.fetchall()
-    data = [(r['key'], r['value'], r['description'], r['updated_at']) for r in rows]
+    data = neon_cur.fetchall()
     execute_values(render_cur, """
         INSERT INTO sdr.settings (key, value, description, updated_at)
         VALUES %s ON CONFLICT (key) DO NOTHING
@@ -50,17 +76,17 @@ def check_counts(render_cur):
 
 def main():
     print("Conectando ao Neon...", flush=True)
-    neon = psycopg2.connect(NEON_URL, connect_timeout=15)
-    neon_cur = neon.cursor(cursor_factory=RealDictCursor)
+    neon = psycopg2.connect(NEON_URL, **_CONNECT_KWARGS)
+    neon_cur = neon.cursor()
 
     print("Conectando ao Render...", flush=True)
-    render = psycopg2.connect(RENDER_URL, connect_timeout=15)
+    render = psycopg2.connect(RENDER_URL, **_CONNECT_KWARGS)
     render.autocommit = False
     render_cur = render.cursor()
 
     try:
         print("\nMigrando email_log...", flush=True)
-        n = migrate_email_log(neon_cur, render_cur)
+        n = migrate_email_log(neon, render, render_cur)
         print(f"  {n} rows processadas (ON CONFLICT DO NOTHING para duplicatas)")
 
         print("Migrando blacklist...", flush=True)
@@ -1,5 +1,5 @@
 """
-Script para corrigir registros de emails enviados manualmente na planilha
+Script para corrigir registros de emails enviados manualmente no banco
 Executar uma única vez para adicionar os 9 emails enviados em 05/02/2026
 """
 import sys
@@ -7,7 +7,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from datetime import datetime, timedelta
-from app.database import get_worksheet, SHEET_COLUMNS, _generate_id, _now_iso
+from app.database import get_cursor, _generate_id
 
 # Data base: 05/02/2026 ~08:45 (15 minutos atrás do mais antigo)
 BASE_TIME = datetime(2026, 2, 5, 8, 45, 0)
@@ -21,7 +21,7 @@ EMAILS_ENVIADOS = [
         "minutes_ago": 1
     },
     {
-        "email_to": "amajundiai2013@gmail.com", 
+        "email_to": "amajundiai2013@gmail.com",
         "subject": "AMA Jundiaí: prontuários para renovação de convênios",
         "nome_clinica": "AMA Jundiaí",
         "minutes_ago": 2
@@ -73,61 +73,59 @@ EMAILS_ENVIADOS = [
 
 def main():
     print("🔄 Iniciando correção de registros de email...")
-    
-    ws = get_worksheet('email_log')
-    
-    # Verifica emails já existentes para evitar duplicatas
-    existing_rows = ws.get_all_values()
-    existing_emails = set()
-    
-    if len(existing_rows) > 1:
-        email_col = SHEET_COLUMNS['email_log'].index('email_to')
-        for row in existing_rows[1:]:
-            if len(row) > email_col:
-                existing_emails.add(row[email_col].lower())
-    
+
+    targets = [e['email_to'].lower() for e in EMAILS_ENVIADOS]
+
+    # Uma query para os já registrados (só os emails do lote) e um
+    # executemany para os que faltam — duas idas ao banco no total
+    with get_cursor() as cur:
+        cur.execute(
+            "SELECT DISTINCT LOWER(email_to) AS email FROM email_log WHERE LOWER(email_to) = ANY(%s)",
+            (targets,)
+        )
+        existing_emails = {row['email'] for row in cur.fetchall()}
+
     print(f"📋 Emails já registrados: {len(existing_emails)}")
-    
-    # Adiciona emails que faltam
-    added = 0
+
+    rows = []
     skipped = 0
-    
+
     for email_data in EMAILS_ENVIADOS:
         email_to = email_data['email_to'].lower()
-        
+
         if email_to in existing_emails:
             print(f"⏭️  Pulando (já existe): {email_to}")
             skipped += 1
             continue
-        
+
         # Calcula timestamp
         sent_time = BASE_TIME + timedelta(minutes=(15 - email_data['minutes_ago']))
-        
-        # Monta linha seguindo SHEET_COLUMNS['email_log']
-        # ['id', 'lead_id', 'campaign_id', 'email_to', 'subject', 'status', 
-        #  'attempt_number', 'resend_id', 'error_message', 'sent_at', 'created_at']
-        row = [
+
+        rows.append((
             _generate_id(),           # id
-            'manual',                  # lead_id (não temos)
-            'manual',                  # campaign_id 
+            'manual',                 # lead_id (não temos)
+            'manual',                 # campaign_id
             email_data['email_to'],   # email_to
             email_data['subject'],    # subject
-            'sent',                    # status
-            1,                         # attempt_number
-            'resend-manual',           # resend_id
-            '',                        # error_message
-            sent_time.isoformat(),    # sent_at
-            sent_time.isoformat()     # created_at
-        ]
-        
-        ws.append_row(row)
+            'sent',                   # status
+            1,                        # attempt_number
+            'resend-manual',          # resend_id
+            '',                       # error_message
+            sent_time,                # sent_at
+            sent_time                 # created_at
+        ))
         print(f"✅ Adicionado: {email_to} ({email_data['nome_clinica']})")
-        added += 1
-    
+
+    if rows:
+        with get_cursor() as cur:
+            cur.executemany("""
+                INSERT INTO email_log (id, lead_id, campaign_id, email_to, subject, body_html, status, attempt_number, resend_id, error_message, sent_at, created_at)
+                VALUES (%s, %s, %s, %s, %s, '', %s, %s, %s, %s, %s, %s)
+            """, rows)
+
     print(f"\n📊 Resumo:")
-    print(f"   ✅ Adicionados: {added}")
+    print(f"   ✅ Adicionados: {len(rows)}")
     print(f"   ⏭️  Pulados: {skipped}")
-    print(f"   📧 Total de envios hoje: {added + len(existing_emails)}")
 
 
 if __name__ == "__main__":
@@ -15,7 +15,9 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from app.database import get_worksheet
+from psycopg2.extras import execute_values
+
+from app.database import get_cursor
 
 
 def fix_email_log_references(dry_run: bool = True):
@@ -28,58 +30,51 @@ def fix_email_log_references(dry_run: bool = True):
     print(f"Modo: {'DRY RUN' if dry_run else 'EXECUÇÃO REAL'}")
     print()
 
-    # Carrega leads
-    ws_leads = get_worksheet('leads', fresh=True)
-    leads_data = ws_leads.get_all_values()
-
-    # Cria mapeamento email -> lead_id
-    lead_headers = leads_data[0]
-    id_col = lead_headers.index('id')
-    email_col = lead_headers.index('email_principal')
-
-    email_to_lead_id = {}
-    valid_lead_ids = set()
+    # Carrega leads e cria mapeamento email -> lead_id. Os filtros de
+    # validade e o LOWER() ficam no SQL; o set e o dict são construídos
+    # por comprehension, sem guards por linha no loop Python
+    with get_cursor() as cur:
+        cur.execute("""
+            SELECT id, LOWER(email_principal) AS email
+            FROM leads
+            WHERE id IS NOT NULL AND id != '' AND id != 'id'
+        """)
+        lead_rows = cur.fetchall()
 
-    for row in leads_data[1:]:
-        lead_id = row[id_col] if len(row) > id_col else ''
-        email = row[email_col].lower() if len(row) > email_col and row[email_col] else ''
-
-        if lead_id and lead_id != 'id':
-            valid_lead_ids.add(lead_id)
-            if email:
-                email_to_lead_id[email] = lead_id
+    valid_lead_ids = {row['id'] for row in lead_rows}
+    email_to_lead_id = {row['email']: row['id'] for row in lead_rows if row['email']}
 
     print(f"Leads válidos: {len(valid_lead_ids)}")
     print(f"Emails mapeados: {len(email_to_lead_id)}")
 
     # Carrega email_log
-    ws_log = get_worksheet('email_log', fresh=True)
-    log_data = ws_log.get_all_values()
-
-    log_headers = log_data[0]
-    log_id_col = log_headers.index('id')
-    log_lead_id_col = log_headers.index('lead_id')
-    log_email_col = log_headers.index('email_to')
-
-    # Encontra emails com referência quebrada
-    to_fix = []
-    for i, row in enumerate(log_data[1:], start=2):
-        log_id = row[log_id_col] if len(row) > log_id_col else ''
-        current_lead_id = row[log_lead_id_col] if len(row) > log_lead_id_col else ''
-        email = row[log_email_col].lower() if len(row) > log_email_col and row[log_email_col] else ''
-
-        # Verifica se lead_id é inválido
-        if current_lead_id not in valid_lead_ids:
-            # Tenta encontrar lead_id correto pelo email
-            correct_lead_id = email_to_lead_id.get(email)
-            if correct_lead_id:
-                to_fix.append({
-                    'row': i,
-                    'log_id': log_id,
-                    'email': email,
-                    'old_lead_id': current_lead_id,
-                    'new_lead_id': correct_lead_id
-                })
+    with get_cursor() as cur:
+        cur.execute("SELECT id, lead_id, LOWER(email_to) AS email FROM email_log")
+        log_rows = cur.fetchall()
+
+    # Curto-circuito pelo caso comum: uma diferença de conjuntos decide
+    # se existe algum lead_id quebrado antes de olhar linha a linha
+    log_lead_ids = {row['lead_id'] or '' for row in log_rows}
+    bad_ids = log_lead_ids - valid_lead_ids
+
+    if not bad_ids:
+        print("\n✅ Nenhuma referência quebrada no email_log.")
+        return
+
+    # Encontra emails com referência quebrada: lead_id inválido, mas com
+    # lead correto localizável pelo email (só as linhas com id ruim
+    # pagam o lookup de email)
+    to_fix = [
+        {
+            'log_id': row['id'],
+            'email': row['email'],
+            'old_lead_id': row['lead_id'] or '',
+            'new_lead_id': email_to_lead_id[row['email']]
+        }
+        for row in log_rows
+        if (row['lead_id'] or '') in bad_ids
+        and row['email'] in email_to_lead_id
+    ]
 
     print(f"Emails a corrigir: {len(to_fix)}")
 
@@ -89,16 +84,23 @@ def fix_email_log_references(dry_run: bool = True):
 
     print("\n--- Correções a aplicar ---")
     for item in to_fix:
-        print(f"  Row {item['row']}: {item['email'][:40]} | '{item['old_lead_id']}' → '{item['new_lead_id']}'")
+        print(f"  Log {item['log_id']}: {item['email'][:40]} | '{item['old_lead_id']}' → '{item['new_lead_id']}'")
 
     if dry_run:
         print("\n⚠️  DRY RUN: Nenhuma alteração foi feita.")
         return
 
-    # Aplica correções
+    # Aplica correções em um único UPDATE set-based (um round-trip para
+    # o lote inteiro, em vez de um UPDATE por linha)
     print("\n--- Aplicando correções ---")
-    for item in to_fix:
-        ws_log.update_cell(item['row'], log_lead_id_col + 1, item['new_lead_id'])
+    with get_cursor() as cur:
+        execute_values(cur, """
+            UPDATE email_log AS el
+            SET lead_id = v.new_lead_id
+            FROM (VALUES %s) AS v(log_id, new_lead_id)
+            WHERE el.id = v.log_id
+        """, [(item['log_id'], item['new_lead_id']) for item in to_fix],
+            page_size=500)
     print(f"  ✓ {len(to_fix)} referências corrigidas")
 
     print("\n✅ Correção concluída!")
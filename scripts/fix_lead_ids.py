@@ -12,11 +12,12 @@ Este script:
 """
 import sys
 from pathlib import Path
-import uuid
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from app.database import get_worksheet, _generate_id
+from psycopg2.extras import execute_values
+
+from app.database import get_cursor, _generate_id
 
 
 def fix_leads_and_email_log(dry_run: bool = True):
@@ -29,30 +30,27 @@ def fix_leads_and_email_log(dry_run: bool = True):
     print(f"Modo: {'DRY RUN' if dry_run else 'EXECUÇÃO REAL'}")
     print()
 
-    # Carrega dados
-    ws_leads = get_worksheet('leads', fresh=True)
-    leads_data = ws_leads.get_all_values()
+    # Carrega dados (ctid identifica a linha física mesmo com id duplicado)
+    with get_cursor() as cur:
+        cur.execute("SELECT ctid, id, email_principal FROM leads")
+        lead_rows = cur.fetchall()
 
-    ws_log = get_worksheet('email_log', fresh=True)
-    log_data = ws_log.get_all_values()
+        cur.execute("SELECT id, lead_id, email_to FROM email_log")
+        log_rows = cur.fetchall()
 
-    print(f"Leads no banco: {len(leads_data) - 1}")
-    print(f"Emails no log: {len(log_data) - 1}")
+    print(f"Leads no banco: {len(lead_rows)}")
+    print(f"Emails no log: {len(log_rows)}")
 
     # Identifica leads com ID corrompido
     corrupted_leads = []
-    lead_headers = leads_data[0]
-    id_col = lead_headers.index('id')
-    email_col = lead_headers.index('email_principal')
-
-    for i, row in enumerate(leads_data[1:], start=2):  # Row numbers in sheet (1-indexed + header)
-        lead_id = row[id_col] if len(row) > id_col else ''
-        email = row[email_col] if len(row) > email_col else ''
+    for row in lead_rows:
+        lead_id = row['id'] or ''
+        email = row['email_principal'] or ''
 
         if lead_id == 'id' or not lead_id or len(lead_id) < 4:
             new_id = _generate_id()
             corrupted_leads.append({
-                'row': i,
+                'ctid': row['ctid'],
                 'old_id': lead_id,
                 'new_id': new_id,
                 'email': email
@@ -64,41 +62,50 @@ def fix_leads_and_email_log(dry_run: bool = True):
         print("\n✅ Nenhum lead com ID corrompido.")
         return
 
-    # Cria mapeamento email -> novo lead_id
-    email_to_lead_id = {lead['email']: lead['new_id'] for lead in corrupted_leads if lead['email']}
-
-    # Encontra emails no log que podem ser atualizados
-    log_headers = log_data[0]
-    log_lead_id_col = log_headers.index('lead_id')
-    log_email_col = log_headers.index('email_to')
-
+    # Mapeamento unificado email -> id final (ids bons preservados,
+    # corrompidos trocados pelo novo) e conjunto de ids válidos
+    # pós-correção. Mapear só os ids recém-gerados deixava de corrigir
+    # log rows 'manual' cujo lead já tinha id bom
+    new_id_by_ctid = {lead['ctid']: lead['new_id'] for lead in corrupted_leads}
+    valid_ids_after_fix = set()
+    final_email_to_id = {}
+    for row in lead_rows:
+        final_id = new_id_by_ctid.get(row['ctid'], row['id'])
+        valid_ids_after_fix.add(final_id)
+        email = (row['email_principal'] or '').lower()
+        if email:
+            final_email_to_id[email] = final_id
+
+    # Uma única passada sobre o log, sondando o hash unificado
     emails_to_update = []
-    for i, row in enumerate(log_data[1:], start=2):
-        log_email = row[log_email_col] if len(row) > log_email_col else ''
-        current_lead_id = row[log_lead_id_col] if len(row) > log_lead_id_col else ''
-
-        if log_email in email_to_lead_id:
-            new_lead_id = email_to_lead_id[log_email]
-            if current_lead_id != new_lead_id:
-                emails_to_update.append({
-                    'row': i,
-                    'email': log_email,
-                    'old_lead_id': current_lead_id,
-                    'new_lead_id': new_lead_id
-                })
+    for row in log_rows:
+        log_email = (row['email_to'] or '').lower()
+        current_lead_id = row['lead_id'] or ''
+
+        if current_lead_id in valid_ids_after_fix:
+            continue
+
+        new_lead_id = final_email_to_id.get(log_email)
+        if new_lead_id and new_lead_id != current_lead_id:
+            emails_to_update.append({
+                'log_id': row['id'],
+                'email': log_email,
+                'old_lead_id': current_lead_id,
+                'new_lead_id': new_lead_id
+            })
 
     print(f"Emails no log a atualizar: {len(emails_to_update)}")
 
     # Mostra preview
     print("\n--- Leads a corrigir (primeiros 10) ---")
     for lead in corrupted_leads[:10]:
-        print(f"  Row {lead['row']}: {lead['email'][:40]} | {lead['old_id']} → {lead['new_id']}")
+        print(f"  {lead['email'][:40]} | {lead['old_id']} → {lead['new_id']}")
     if len(corrupted_leads) > 10:
         print(f"  ... e mais {len(corrupted_leads) - 10}")
 
     print("\n--- Emails a atualizar (primeiros 10) ---")
     for log in emails_to_update[:10]:
-        print(f"  Row {log['row']}: {log['email'][:40]} | {log['old_lead_id']} → {log['new_lead_id']}")
+        print(f"  {log['email'][:40]} | {log['old_lead_id']} → {log['new_lead_id']}")
     if len(emails_to_update) > 10:
         print(f"  ... e mais {len(emails_to_update) - 10}")
 
@@ -106,19 +113,34 @@ def fix_leads_and_email_log(dry_run: bool = True):
         print("\n⚠️  DRY RUN: Nenhuma alteração foi feita.")
         return
 
-    # Executa correções
+    # Executa correções: um UPDATE set-based por tabela (dois round-trips
+    # no total, em vez de um por linha corrigida)
     print("\n--- Aplicando correções ---")
 
-    # 1. Corrige IDs nos leads
+    # 1. Corrige IDs nos leads (endereçados por ctid, já que o id atual
+    # está corrompido e pode se repetir)
     print("Corrigindo IDs dos leads...")
-    for lead in corrupted_leads:
-        ws_leads.update_cell(lead['row'], id_col + 1, lead['new_id'])
+    with get_cursor() as cur:
+        execute_values(cur, """
+            UPDATE leads AS l
+            SET id = v.new_id
+            FROM (VALUES %s) AS v(ctid_text, new_id)
+            WHERE l.ctid = v.ctid_text::tid
+        """, [(str(lead['ctid']), lead['new_id']) for lead in corrupted_leads],
+            page_size=500)
     print(f"  ✓ {len(corrupted_leads)} leads corrigidos")
 
     # 2. Atualiza referências no email_log
     print("Atualizando referências no email_log...")
-    for log in emails_to_update:
-        ws_log.update_cell(log['row'], log_lead_id_col + 1, log['new_lead_id'])
+    if emails_to_update:
+        with get_cursor() as cur:
+            execute_values(cur, """
+                UPDATE email_log AS el
+                SET lead_id = v.new_lead_id
+                FROM (VALUES %s) AS v(log_id, new_lead_id)
+                WHERE el.id = v.log_id
+            """, [(log['log_id'], log['new_lead_id']) for log in emails_to_update],
+                page_size=500)
     print(f"  ✓ {len(emails_to_update)} emails atualizados")
 
     print("\n✅ Correção concluída!")
@@ -1,131 +1,210 @@
 """
-Splits the migration SQL into per-table files and imports via render psql.
+Imports the migration dump into Render over a small pool of persistent
+psycopg2 connections (one per worker thread). Prefers the JSONL sidecar
+(rows imported via execute_values — one server-side parse per batch);
+falls back to splitting the plain SQL file into per-table INSERT
+sections. Chunks within a table are independent (ON CONFLICT DO
+NOTHING), so they are uploaded in parallel.
 """
-import subprocess
 import sys
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import psycopg2
+from psycopg2.extras import execute_values, Json
+
+try:
+    import orjson as _json_parser
+except ImportError:
+    import json as _json_parser
 
 SQL_FILE = '/tmp/neon_to_render_migration.sql'
-DB_ID = 'dpg-d07n3madbo4c73ehoiqg-a'
+JSONL_FILE = '/tmp/neon_to_render_migration.jsonl'
+RENDER_URL = os.environ["RENDER_DATABASE_URL"]
+
+MAX_WORKERS = 4
+
+# Uma conexão autocommit por worker thread (conexões psycopg2 não são
+# compartilháveis entre cursores concorrentes)
+_tls = threading.local()
+_worker_conns = []
+_worker_conns_lock = threading.Lock()
+
+def _worker_conn():
+    conn = getattr(_tls, 'conn', None)
+    if conn is None:
+        conn = psycopg2.connect(RENDER_URL, connect_timeout=15)
+        conn.autocommit = True
+        _tls.conn = conn
+        with _worker_conns_lock:
+            _worker_conns.append(conn)
+    return conn
+
+def _close_worker_conns():
+    with _worker_conns_lock:
+        for conn in _worker_conns:
+            conn.close()
+        _worker_conns.clear()
+
+# Section markers, keyed by the part before the ':' so one dict lookup
+# replaces the chain of per-table startswith checks
+TABLE_MARKERS = {
+    f'-- {t}': t
+    for t in ('campaigns', 'leads', 'email_log', 'blacklist', 'email_events', 'settings')
+}
 
 def split_sql():
     """Split SQL file into table sections"""
-    with open(SQL_FILE, 'r') as f:
-        lines = f.readlines()
-    
-    # Find section boundaries
     sections = {}
     current_table = None
     current_lines = []
-    
-    for line in lines:
-        if line.startswith('-- campaigns:'):
-            current_table = 'campaigns'
-            current_lines = []
-        elif line.startswith('-- leads:'):
-            if current_table:
-                sections[current_table] = current_lines
-            current_table = 'leads'
-            current_lines = []
-        elif line.startswith('-- email_log:'):
-            if current_table:
-                sections[current_table] = current_lines
-            current_table = 'email_log'
-            current_lines = []
-        elif line.startswith('-- blacklist:'):
-            if current_table:
-                sections[current_table] = current_lines
-            current_table = 'blacklist'
-            current_lines = []
-        elif line.startswith('-- email_events:'):
-            if current_table:
-                sections[current_table] = current_lines
-            current_table = 'email_events'
-            current_lines = []
-        elif line.startswith('-- settings:'):
-            if current_table:
-                sections[current_table] = current_lines
-            current_table = 'settings'
-            current_lines = []
-        elif line.strip() in ('COMMIT;', ''):
-            pass
-        
-        if current_table and line.startswith('INSERT'):
-            current_lines.append(line)
-    
+
+    # Stream the file instead of readlines() (file can be several MB)
+    with open(SQL_FILE, 'r') as f:
+        for line in f:
+            if line[:2] == '--':
+                new_table = TABLE_MARKERS.get(line.split(':', 1)[0])
+                if new_table:
+                    if current_table:
+                        sections[current_table] = current_lines
+                    current_table = new_table
+                    current_lines = []
+                continue
+            # Cheap first-char filter before the startswith call
+            if current_table and line[0] == 'I' and line.startswith('INSERT'):
+                current_lines.append(line)
+
     if current_table:
         sections[current_table] = current_lines
-    
+
     return sections
 
-def run_sql_safely(sql):
-    """Execute via render psql -c directly avoiding shell quoting issues"""
+def load_jsonl():
+    """Load the parsed-rows sidecar written by migrate_neon_to_render"""
+    if not os.path.exists(JSONL_FILE):
+        return None, None
+
+    sections = {}
+    columns = {}
+    with open(JSONL_FILE, 'r') as f:
+        for line in f:
+            rec = _json_parser.loads(line)
+            table = rec['table']
+            if 'columns' in rec:
+                columns[table] = rec['columns']
+                sections.setdefault(table, [])
+            else:
+                # Colunas JSONB (ex.: email_events.payload) voltam do
+                # sidecar como dict/list; psycopg2 não adapta esses
+                # tipos sozinho — embrulha em Json para o execute_values
+                sections[table].append(tuple(
+                    Json(v) if isinstance(v, (dict, list)) else v
+                    for v in rec['row']
+                ))
+    return sections, columns
+
+def _run_values_chunk(table, cols_str, rows):
     try:
-        result = subprocess.run(
-            ['render', 'psql', DB_ID, '-c', sql],
-            capture_output=True, text=True, timeout=120
-        )
-        if result.returncode != 0:
-            return False, result.stderr
+        with _worker_conn().cursor() as cur:
+            execute_values(cur, f"""
+                INSERT INTO sdr.{table} ({cols_str})
+                VALUES %s ON CONFLICT DO NOTHING
+            """, rows, page_size=500)
         return True, ""
-    except OSError as e:
-        if e.errno == 7:  # Argument list too long
-            return False, "ARG_MAX"
-        raise
+    except psycopg2.Error as e:
+        return False, str(e)
+
+def import_section_values(table, cols, rows):
+    """Import parsed rows with execute_values, chunks in parallel"""
+    if not rows:
+        print(f"  {table}: 0 rows (skip)")
+        return True
+
+    cols_str = ', '.join(cols)
+    chunk_size = 500
+    chunks = [rows[i:i+chunk_size] for i in range(0, len(rows), chunk_size)]
+    print(f"  {table}: {len(rows)} rows in {len(chunks)} chunks")
+
+    with ThreadPoolExecutor(MAX_WORKERS) as pool:
+        futures = {
+            pool.submit(_run_values_chunk, table, cols_str, chunk): i
+            for i, chunk in enumerate(chunks)
+        }
+        for future in as_completed(futures):
+            ok, err = future.result()
+            if not ok:
+                print(f"  ERROR chunk {futures[future]}: {err[:200]}")
+                return False
+    print(f"    {len(chunks)} chunks OK")
+    return True
+
+def _run_sql_chunk(sql):
+    try:
+        with _worker_conn().cursor() as cur:
+            cur.execute(sql)
+        return True, ""
+    except psycopg2.Error as e:
+        return False, str(e)
 
 def import_section(table, lines):
-    """Import a section via render psql"""
+    """Import a section of INSERT statements, chunks in parallel"""
     if not lines:
         print(f"  {table}: 0 rows (skip)")
         return True
-    
-    # Split into chunks (small enough for shell argument limit)
-    chunk_size = 25 if table in ('leads', 'email_log') else 100
+
+    # One execute per chunk of statements; sem shell no caminho, o limite
+    # de ARG_MAX (e o sub-chunking de 5 linhas) deixou de existir
+    chunk_size = 500
     chunks = [lines[i:i+chunk_size] for i in range(0, len(lines), chunk_size)]
     print(f"  {table}: {len(lines)} rows in {len(chunks)} chunks")
-    
-    for i, chunk in enumerate(chunks):
-        # Add ON CONFLICT DO NOTHING to avoid errors on rows already imported
-        safe_lines = [
-            line.rstrip(';\n') + ' ON CONFLICT DO NOTHING;\n' if line.startswith('INSERT') else line
-            for line in chunk
-        ]
-        sql = f"SET search_path TO sdr;\n" + ''.join(safe_lines)
-
-        ok, err = run_sql_safely(sql)
-        if not ok:
-            # Try even smaller chunks
-            sub_size = 5
-            sub_chunks = [safe_lines[j:j+sub_size] for j in range(0, len(safe_lines), sub_size)]
-            for si, sub in enumerate(sub_chunks):
-                sub_sql = f"SET search_path TO sdr;\n" + ''.join(sub)
-                ok2, err2 = run_sql_safely(sub_sql)
-                if not ok2:
-                    print(f"  ERROR chunk {i}.{si}: {err2[:200]}")
-                    return False
-            print(f"    chunk {i+1}/{len(chunks)}: OK ({len(chunk)} rows, sub-chunked)")
-        else:
-            print(f"    chunk {i+1}/{len(chunks)}: OK ({len(chunk)} rows)")
+
+    with ThreadPoolExecutor(MAX_WORKERS) as pool:
+        futures = {}
+        for i, chunk in enumerate(chunks):
+            # Add ON CONFLICT DO NOTHING to avoid errors on rows already imported
+            sql = ''.join(
+                line.rstrip(';\n') + ' ON CONFLICT DO NOTHING;\n' if line.startswith('INSERT') else line
+                for line in chunk
+            )
+            futures[pool.submit(_run_sql_chunk, sql)] = i
+        for future in as_completed(futures):
+            ok, err = future.result()
+            if not ok:
+                print(f"  ERROR chunk {futures[future]}: {err[:200]}")
+                return False
+    print(f"    {len(chunks)} chunks OK")
     return True
 
 def main():
-    print("Splitting SQL file...")
-    sections = split_sql()
-    
-    for table, lines in sections.items():
-        print(f"\nFound: {table} = {len(lines)} rows")
-    
+    sections, columns = load_jsonl()
+    use_values = sections is not None
+    if use_values:
+        print("Using JSONL sidecar...")
+    else:
+        print("Splitting SQL file...")
+        sections = split_sql()
+
+    for table, rows in sections.items():
+        print(f"\nFound: {table} = {len(rows)} rows")
+
     # Import in order (respecting FKs) — campaigns and leads already imported
     order = ['email_log', 'blacklist', 'email_events', 'settings']
-    
+
     print("\n=== Importing ===")
-    for table in order:
-        lines = sections.get(table, [])
-        ok = import_section(table, lines)
-        if not ok:
-            print(f"FAILED at {table}. Stopping.")
-            sys.exit(1)
-    
+    try:
+        for table in order:
+            rows = sections.get(table, [])
+            if use_values:
+                ok = import_section_values(table, columns.get(table, []), rows)
+            else:
+                ok = import_section(table, rows)
+            if not ok:
+                print(f"FAILED at {table}. Stopping.")
+                sys.exit(1)
+    finally:
+        _close_worker_conns()
+
     print("\n=== DONE! ===")
 
 if __name__ == '__main__':
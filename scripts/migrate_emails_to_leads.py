@@ -8,73 +8,52 @@ Este script:
 3. Preserva o vínculo campaign_id
 
 Uso:
-    python scripts/migrate_emails_to_leads.py --dry-run  # Apenas mostra o que seria feito
-    python scripts/migrate_emails_to_leads.py            # Executa a migração
+    python scripts/migrate_emails_to_leads.py            # Apenas mostra o que seria feito
+    python scripts/migrate_emails_to_leads.py --execute  # Executa a migração
 """
 import sys
 from pathlib import Path
-from datetime import datetime
 
 # Adiciona o diretório raiz ao path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from app.database import get_worksheet, SHEET_COLUMNS, _generate_id, _now_iso
+from psycopg2.extras import execute_values
 
+from app.database import get_cursor, insert_leads_bulk
 
-def get_all_leads():
-    """Retorna todos os leads do banco."""
-    ws = get_worksheet('leads')
-    all_rows = ws.get_all_values()
 
-    if len(all_rows) <= 1:
-        return {}
+def get_all_lead_ids() -> set:
+    """Retorna o conjunto de IDs de leads existentes."""
+    with get_cursor() as cur:
+        cur.execute("SELECT id FROM leads")
+        return {row['id'] for row in cur.fetchall()}
 
-    headers = all_rows[0]
-    leads = {}
 
-    for row in all_rows[1:]:
-        lead_id = row[0] if row else None
-        if lead_id:
-            lead_dict = {headers[i]: row[i] if i < len(row) else '' for i in range(len(headers))}
-            leads[lead_id] = lead_dict
-
-    return leads
-
-
-def get_all_email_logs():
+def get_all_email_logs() -> list:
     """Retorna todos os logs de email."""
-    ws = get_worksheet('email_log')
-    all_rows = ws.get_all_values()
-
-    if len(all_rows) <= 1:
-        return []
-
-    headers = all_rows[0]
-    logs = []
+    with get_cursor() as cur:
+        cur.execute("""
+            SELECT id, lead_id, campaign_id, email_to, sent_at
+            FROM email_log
+        """)
+        return cur.fetchall()
 
-    for row in all_rows[1:]:
-        log_dict = {headers[i]: row[i] if i < len(row) else '' for i in range(len(headers))}
-        logs.append(log_dict)
 
-    return logs
-
-
-def find_orphan_emails(leads: dict, email_logs: list) -> list:
+def find_orphan_emails(lead_ids: set, email_logs: list) -> list:
     """
     Encontra emails que não têm lead correspondente.
 
     Args:
-        leads: Dicionário de leads {id: dados}
+        lead_ids: Conjunto de IDs de leads existentes
         email_logs: Lista de logs de email
 
     Returns:
         Lista de emails órfãos (sem lead no banco)
     """
     orphans = []
-    lead_ids = set(leads.keys())
 
     for log in email_logs:
-        lead_id = log.get('lead_id', '')
+        lead_id = log.get('lead_id') or ''
         if lead_id and lead_id not in lead_ids:
             orphans.append(log)
 
@@ -90,7 +69,7 @@ def extract_clinic_name_from_email(email: str) -> str:
     local_part = email.split('@')[0]
 
     # Padrões comuns
-    if local_part in ['contato', 'contato', 'info', 'atendimento', 'agendamento']:
+    if local_part in ['contato', 'info', 'atendimento', 'agendamento']:
         # Tenta usar o domínio
         domain = email.split('@')[1].split('.')[0] if '@' in email else ''
         return domain.title() if domain else "Lead migrado"
@@ -106,54 +85,25 @@ def create_lead_from_email(email_log: dict) -> dict:
         email_log: Dados do email
 
     Returns:
-        Dicionário com dados do lead
+        Dicionário no formato aninhado esperado por insert_lead
     """
-    email = email_log.get('email_to', '')
-    campaign_id = email_log.get('campaign_id', '')
-    sent_at = email_log.get('sent_at', '')
-
-    # Tenta extrair nome da clínica do campo nome_clinica se existir, senão do email
-    nome = email_log.get('nome_clinica') or extract_clinic_name_from_email(email)
+    email = email_log.get('email_to') or ''
+    sent_at = email_log.get('sent_at')
 
     return {
-        'id': _generate_id(),
-        'campaign_id': campaign_id,
-        'nome_clinica': nome,
-        'endereco': '',
-        'cidade_uf': '',
-        'cnpj': '',
-        'site': '',
-        'decisor_nome': '',
-        'decisor_cargo': '',
-        'decisor_linkedin': '',
-        'email_principal': email,
-        'email_tipo': 'migrado',
-        'telefone': '',
-        'whatsapp': '',
-        'instagram': '',
+        'nome_clinica': extract_clinic_name_from_email(email),
+        'contatos': {
+            'email_principal': email,
+            'email_tipo': 'migrado',
+        },
         'fonte': 'migrado_email_log',
         'confianca': 'baixa',
         'score': 0,
-        # Campos contexto_abordagem vazios
-        'resumo_clinica': '',
-        'perfil_decisor': '',
-        'gancho_personalizacao': '',
-        'dor_provavel': '',
-        'tom_sugerido': '',
-        'raw_data': f'{{"migrado_de": "email_log", "email_original": "{email}", "sent_at": "{sent_at}"}}',
-        'created_at': _now_iso()
+        'migrado_de': 'email_log',
+        'sent_at': str(sent_at) if sent_at else '',
     }
 
 
-def find_email_log_row(ws_log, log_id: str) -> int:
-    """Encontra a linha no email_log pelo ID."""
-    all_rows = ws_log.get_all_values()
-    for i, row in enumerate(all_rows[1:], start=2):
-        if row and row[0] == log_id:
-            return i
-    return -1
-
-
 def migrate_orphan_emails(dry_run: bool = True):
     """
     Executa a migração de emails órfãos para leads.
@@ -169,14 +119,14 @@ def migrate_orphan_emails(dry_run: bool = True):
 
     # Carrega dados
     print("Carregando dados...")
-    leads = get_all_leads()
+    lead_ids = get_all_lead_ids()
     email_logs = get_all_email_logs()
 
-    print(f"  • Leads no banco: {len(leads)}")
+    print(f"  • Leads no banco: {len(lead_ids)}")
     print(f"  • Emails no log: {len(email_logs)}")
 
     # Encontra órfãos
-    orphans = find_orphan_emails(leads, email_logs)
+    orphans = find_orphan_emails(lead_ids, email_logs)
     print(f"  • Emails órfãos (sem lead): {len(orphans)}")
 
     if not orphans:
@@ -192,64 +142,37 @@ def migrate_orphan_emails(dry_run: bool = True):
 
     if dry_run:
         print("\n⚠️  DRY RUN: Nenhuma alteração foi feita.")
-        print("    Execute sem --dry-run para aplicar as alterações.")
+        print("    Execute com --execute para aplicar as alterações.")
         return
 
-    # Executa migração
+    # Executa migração em lote: um insert_leads_bulk por campanha e um
+    # único UPDATE set-based para religar o email_log, em vez de um
+    # INSERT + UPDATE por órfão
     print("\n--- Executando migração ---")
-    ws_leads = get_worksheet('leads', fresh=True)
-    ws_log = get_worksheet('email_log', fresh=True)
-    migrated = 0
 
+    by_campaign = {}
     for orphan in orphans:
-        lead_data = create_lead_from_email(orphan)
-        old_lead_id = orphan.get('lead_id', '')
-        new_lead_id = lead_data['id']
-        log_id = orphan.get('id', '')
-
-        # Cria linha para inserir
-        row = [
-            lead_data['id'],
-            lead_data['campaign_id'],
-            lead_data['nome_clinica'],
-            lead_data['endereco'],
-            lead_data['cidade_uf'],
-            lead_data['cnpj'],
-            lead_data['site'],
-            lead_data['decisor_nome'],
-            lead_data['decisor_cargo'],
-            lead_data['decisor_linkedin'],
-            lead_data['email_principal'],
-            lead_data['email_tipo'],
-            lead_data['telefone'],
-            lead_data['whatsapp'],
-            lead_data['instagram'],
-            lead_data['fonte'],
-            lead_data['confianca'],
-            lead_data['score'],
-            lead_data['resumo_clinica'],
-            lead_data['perfil_decisor'],
-            lead_data['gancho_personalizacao'],
-            lead_data['dor_provavel'],
-            lead_data['tom_sugerido'],
-            lead_data['raw_data'],
-            lead_data['created_at']
-        ]
-
-        # 1. Insere o lead (usando insert_row para garantir inserção)
-        all_values = ws_leads.get_all_values()
-        next_row = len(all_values) + 1
-        ws_leads.insert_row(row, next_row)
-
-        # 2. Atualiza o email_log para referenciar o novo lead_id
-        log_row = find_email_log_row(ws_log, log_id)
-        if log_row > 0:
-            ws_log.update_cell(log_row, 2, new_lead_id)  # Coluna 2 = lead_id
-
-        migrated += 1
-        print(f"  ✓ Migrado: {lead_data['email_principal']} → lead {new_lead_id} (log row {log_row})")
-
-    print(f"\n✅ Migração concluída: {migrated} leads criados")
+        campaign_id = orphan.get('campaign_id') or 'migrado'
+        by_campaign.setdefault(campaign_id, []).append(orphan)
+
+    log_updates = []
+    for campaign_id, group in by_campaign.items():
+        leads_data = [create_lead_from_email(orphan) for orphan in group]
+        new_lead_ids = insert_leads_bulk(campaign_id, leads_data)
+
+        for orphan, lead_data, new_lead_id in zip(group, leads_data, new_lead_ids):
+            log_updates.append((orphan.get('id'), new_lead_id))
+            print(f"  ✓ Migrado: {lead_data['contatos']['email_principal']} → lead {new_lead_id}")
+
+    with get_cursor() as cur:
+        execute_values(cur, """
+            UPDATE email_log AS el
+            SET lead_id = v.new_lead_id
+            FROM (VALUES %s) AS v(log_id, new_lead_id)
+            WHERE el.id = v.log_id
+        """, log_updates, page_size=500)
+
+    print(f"\n✅ Migração concluída: {len(log_updates)} leads criados")
 
 
 def main():
@@ -1,124 +1,201 @@
 """
 Script de migração: Neon → Render (schema sdr)
-Lê dados do Neon via psycopg2 e gera arquivo SQL para importar via render psql.
+
+Com RENDER_DATABASE_URL definido, copia as tabelas direto de Postgres
+para Postgres via COPY (sem arquivo intermediário). Sem ele, gera o
+arquivo SQL para importar via render psql (caminho antigo).
 """
+import io
 import psycopg2
-from psycopg2.extras import RealDictCursor
 import json
 import sys
 
 import os
 NEON_URL = os.environ["NEON_DATABASE_URL"]
+RENDER_URL = os.environ.get("RENDER_DATABASE_URL")
+
+# Tabelas na ordem de importação (respeitando FKs).
+# blacklist sem a coluna domain (é GENERATED).
+TABLES = [
+    ('campaigns', ['id', 'name', 'region', 'description', 'created_at', 'updated_at',
+                   'status', 'total_leads', 'emails_sent', 'emails_failed']),
+    ('leads', ['id', 'campaign_id', 'status', 'nome_clinica', 'endereco', 'cidade_uf', 'cnpj', 'site',
+               'decisor_nome', 'decisor_cargo', 'decisor_linkedin', 'email_principal', 'email_tipo',
+               'telefone', 'whatsapp', 'instagram', 'fonte', 'confianca', 'score',
+               'resumo_clinica', 'perfil_decisor', 'gancho_personalizacao', 'dor_provavel', 'tom_sugerido',
+               'notas', 'motivo_descarte', 'raw_data', 'created_at', 'updated_at']),
+    ('email_log', ['id', 'lead_id', 'campaign_id', 'email_to', 'subject', 'body_html', 'status',
+                   'attempt_number', 'resend_id', 'error_message', 'sent_at', 'created_at']),
+    ('blacklist', ['id', 'email', 'reason', 'source_campaign_id', 'added_at']),
+    ('email_events', ['email_log_id', 'event_type', 'payload', 'created_at']),
+    ('settings', ['key', 'value', 'description', 'updated_at']),
+]
+
+
+# Escape de aspas em uma passada C única (translate, não replace)
+_ESC_QUOTE = str.maketrans({"'": "''"})
+
+# OIDs dos tipos que não são formatados como texto
+_NUM_OIDS = frozenset({20, 21, 23, 26, 700, 701, 1700})   # int*/oid/float*/numeric
+_BOOL_OID = 16
+_JSON_OIDS = frozenset({114, 3802})                        # json/jsonb
+
+
+def _fmt_num(val):
+    return 'NULL' if val is None else str(val)
 
-def escape_sql(val):
-    """Escapa valor para SQL"""
+
+def _fmt_bool(val):
+    if val is None:
+        return 'NULL'
+    return 'TRUE' if val else 'FALSE'
+
+
+def _fmt_json(val):
     if val is None:
         return 'NULL'
-    if isinstance(val, bool):
-        return 'TRUE' if val else 'FALSE'
-    if isinstance(val, (int, float)):
-        return str(val)
-    if isinstance(val, dict):
+    if isinstance(val, (dict, list)):
         val = json.dumps(val, ensure_ascii=False)
-    s = str(val).replace("'", "''")
-    return f"'{s}'"
-
-def fetch_all(cur, table):
-    cur.execute(f"SELECT * FROM {table}")
-    return cur.fetchall()
-
-def generate_insert(schema, table, rows, columns):
-    """Gera INSERT statements para uma tabela"""
-    if not rows:
-        return ""
-    
-    lines = []
-    lines.append(f"-- {table}: {len(rows)} rows")
-    
-    for row in rows:
-        vals = []
-        for col in columns:
-            vals.append(escape_sql(row.get(col)))
-        cols_str = ', '.join(columns)
-        vals_str = ', '.join(vals)
-        lines.append(f"INSERT INTO {schema}.{table} ({cols_str}) VALUES ({vals_str});")
-    
-    return '\n'.join(lines)
+    return "'" + str(val).translate(_ESC_QUOTE) + "'"
 
-def main():
+
+def _fmt_text(val):
+    return 'NULL' if val is None else "'" + str(val).translate(_ESC_QUOTE) + "'"
+
+
+def make_formatter(type_code):
+    """Retorna o formatador SQL especializado para o OID da coluna"""
+    if type_code in _NUM_OIDS:
+        return _fmt_num
+    if type_code == _BOOL_OID:
+        return _fmt_bool
+    if type_code in _JSON_OIDS:
+        return _fmt_json
+    return _fmt_text
+
+
+def column_formatters(conn, table, columns):
+    """Resolve os formatadores por coluna uma vez, via cur.description"""
+    with conn.cursor() as cur:
+        cur.execute(f"SELECT {', '.join(columns)} FROM {table} LIMIT 0")
+        return [make_formatter(d.type_code) for d in cur.description]
+
+
+def copy_table(src, dst, table, columns):
+    """
+    Copia uma tabela inteira via COPY TO STDOUT → COPY FROM STDIN.
+
+    Sem parse/plan de INSERT por linha no destino e sem o workaround de
+    ARG_MAX do caminho render psql. Assume tabela de destino vazia
+    (COPY não tem ON CONFLICT — para re-execuções incrementais use
+    finish_migration.py).
+
+    Returns:
+        Número de linhas copiadas
+    """
+    cols = ', '.join(columns)
+    buf = io.BytesIO()
+
+    with src.cursor() as sc:
+        sc.copy_expert(f"COPY {table} ({cols}) TO STDOUT", buf)
+
+    buf.seek(0)
+    with dst.cursor() as dc:
+        dc.copy_expert(f"COPY sdr.{table} ({cols}) FROM STDIN", buf)
+        copied = dc.rowcount
+
+    dst.commit()
+    return copied
+
+
+def migrate_direct():
+    """Migra todas as tabelas por conexão direta Neon → Render"""
+    print("Conectando ao Neon...", file=sys.stderr)
+    src = psycopg2.connect(NEON_URL, connect_timeout=15)
+
+    print("Conectando ao Render...", file=sys.stderr)
+    dst = psycopg2.connect(RENDER_URL, connect_timeout=15)
+
+    try:
+        for table, columns in TABLES:
+            print(f"Copiando {table}...", file=sys.stderr)
+            n = copy_table(src, dst, table, columns)
+            print(f"  {n} rows", file=sys.stderr)
+    finally:
+        src.close()
+        dst.close()
+
+    print("Done!", file=sys.stderr)
+
+
+def iter_rows(conn, table, columns):
+    """Itera as linhas de uma tabela via cursor server-side (named).
+
+    Cursor de tuplas, não RealDictCursor: o SELECT fixa a ordem das
+    colunas, então a formatação indexa por posição sem pagar um dict
+    por linha.
+    """
+    cur = conn.cursor(name=f'mig_{table}')
+    cur.itersize = 5000
+    cur.execute(f"SELECT {', '.join(columns)} FROM {table}")
+    return cur
+
+
+def generate_sql_file():
+    """Gera o arquivo SQL (e o sidecar JSONL) para importar no Render"""
     print("Conectando ao Neon...", file=sys.stderr)
     conn = psycopg2.connect(NEON_URL, connect_timeout=15)
-    cur = conn.cursor(cursor_factory=RealDictCursor)
-    
-    output = []
-    output.append("SET search_path TO sdr;")
-    output.append("BEGIN;")
-    output.append("")
-    
-    # 1. campaigns
-    print("Exportando campaigns...", file=sys.stderr)
-    rows = fetch_all(cur, 'campaigns')
-    cols = ['id', 'name', 'region', 'description', 'created_at', 'updated_at', 'status', 'total_leads', 'emails_sent', 'emails_failed']
-    output.append(generate_insert('sdr', 'campaigns', rows, cols))
-    output.append("")
-    
-    # 2. leads
-    print("Exportando leads...", file=sys.stderr)
-    rows = fetch_all(cur, 'leads')
-    cols = ['id', 'campaign_id', 'status', 'nome_clinica', 'endereco', 'cidade_uf', 'cnpj', 'site',
-            'decisor_nome', 'decisor_cargo', 'decisor_linkedin', 'email_principal', 'email_tipo',
-            'telefone', 'whatsapp', 'instagram', 'fonte', 'confianca', 'score',
-            'resumo_clinica', 'perfil_decisor', 'gancho_personalizacao', 'dor_provavel', 'tom_sugerido',
-            'notas', 'motivo_descarte', 'raw_data', 'created_at', 'updated_at']
-    output.append(generate_insert('sdr', 'leads', rows, cols))
-    output.append("")
-    
-    # 3. email_log
-    print("Exportando email_log...", file=sys.stderr)
-    rows = fetch_all(cur, 'email_log')
-    cols = ['id', 'lead_id', 'campaign_id', 'email_to', 'subject', 'body_html', 'status',
-            'attempt_number', 'resend_id', 'error_message', 'sent_at', 'created_at']
-    output.append(generate_insert('sdr', 'email_log', rows, cols))
-    output.append("")
-    
-    # 4. blacklist (sem domain, é GENERATED)
-    print("Exportando blacklist...", file=sys.stderr)
-    rows = fetch_all(cur, 'blacklist')
-    cols = ['id', 'email', 'reason', 'source_campaign_id', 'added_at']
-    output.append(generate_insert('sdr', 'blacklist', rows, cols))
-    output.append("")
-    
-    # 5. email_events
-    print("Exportando email_events...", file=sys.stderr)
-    rows = fetch_all(cur, 'email_events')
-    if rows:
-        cols = ['email_log_id', 'event_type', 'payload', 'created_at']
-        output.append(generate_insert('sdr', 'email_events', rows, cols))
-        output.append("")
-    else:
-        output.append("-- email_events: 0 rows (vazia)")
-        output.append("")
-    
-    # 6. settings
-    print("Exportando settings...", file=sys.stderr)
-    rows = fetch_all(cur, 'settings')
-    cols = ['key', 'value', 'description', 'updated_at']
-    output.append(generate_insert('sdr', 'settings', rows, cols))
-    output.append("")
-    
-    output.append("COMMIT;")
-    
-    # Write to file
-    sql = '\n'.join(output)
-    with open('/tmp/neon_to_render_migration.sql', 'w') as f:
-        f.write(sql)
-    
-    print(f"\nArquivo gerado: /tmp/neon_to_render_migration.sql", file=sys.stderr)
-    print(f"Tamanho: {len(sql)} bytes", file=sys.stderr)
-    
-    cur.close()
+
+    out_path = '/tmp/neon_to_render_migration.sql'
+    jsonl_path = '/tmp/neon_to_render_migration.jsonl'
+
+    # Escrita incremental: cada INSERT vai direto para o arquivo e as
+    # linhas vêm do cursor server-side em blocos de itersize — nem o
+    # dump nem a tabela inteira ficam em memória de uma vez. O sidecar
+    # JSONL carrega as linhas já parseadas para o import_to_render usar
+    # execute_values (um parse por lote no servidor, não por linha)
+    with open(out_path, 'w', buffering=1 << 20) as f, \
+            open(jsonl_path, 'w', buffering=1 << 20) as jf:
+        f.write("SET search_path TO sdr;\nBEGIN;\n\n")
+
+        for table, cols in TABLES:
+            print(f"Exportando {table}...", file=sys.stderr)
+            formatters = column_formatters(conn, table, cols)
+            cols_str = ', '.join(cols)
+            cur = iter_rows(conn, table, cols)
+            count = 0
+            f.write(f"-- {table}:\n")
+            jf.write(json.dumps({'table': table, 'columns': cols}) + '\n')
+            for row in cur:
+                # Dispatch direto no formatador da coluna, por posição,
+                # sem re-testar o tipo do valor a cada célula
+                vals_str = ', '.join(fmt(val) for fmt, val in zip(formatters, row))
+                f.write(f"INSERT INTO sdr.{table} ({cols_str}) VALUES ({vals_str});\n")
+                jf.write(json.dumps(
+                    {'table': table, 'row': list(row)},
+                    ensure_ascii=False, default=str
+                ))
+                jf.write('\n')
+                count += 1
+            cur.close()
+            f.write("\n")
+            print(f"  {count} rows", file=sys.stderr)
+
+        f.write("COMMIT;\n")
+
+    print(f"\nArquivos gerados: {out_path} + {jsonl_path}", file=sys.stderr)
+    print(f"Tamanho SQL: {os.path.getsize(out_path)} bytes", file=sys.stderr)
+
     conn.close()
     print("Done!", file=sys.stderr)
 
+
+def main():
+    if RENDER_URL:
+        migrate_direct()
+    else:
+        generate_sql_file()
+
+
 if __name__ == '__main__':
     main()
@@ -8,10 +8,11 @@ Uso:
     python scripts/migrate_to_sql.py              # Modo dry-run (não insere)
     python scripts/migrate_to_sql.py --execute    # Executa migração
 """
+import io
 import sys
 import os
-import json
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
@@ -30,6 +31,12 @@ SPREADSHEET_ID = os.getenv('GOOGLE_SHEETS_SPREADSHEET_ID')
 CREDENTIALS_PATH = Path(__file__).parent.parent / os.getenv('GOOGLE_SHEETS_CREDENTIALS_PATH', 'credentials.json')
 DATABASE_URL = os.getenv('DATABASE_URL')
 
+# Domínios válidos por coluna (frozensets no módulo: membership O(1),
+# sem reconstruir a tupla a cada linha)
+VALID_CONFIANCA = frozenset({'', 'alta', 'media', 'baixa'})
+VALID_EMAIL_STATUS = frozenset({'pending', 'sent', 'failed', 'bounced', 'rejected'})
+VALID_BLACKLIST_REASON = frozenset({'user_request', 'hard_bounce', 'spam_complaint', 'manual', 'invalid_email'})
+
 SHEET_COLUMNS = {
     'campaigns': ['id', 'name', 'region', 'created_at', 'status', 'total_leads', 'emails_sent', 'emails_failed'],
     'leads': ['id', 'campaign_id', 'nome_clinica', 'endereco', 'cidade_uf', 'cnpj', 'site',
@@ -59,34 +66,67 @@ def connect_sql():
     return psycopg2.connect(DATABASE_URL)
 
 
-def read_sheet(spreadsheet, sheet_name):
-    """Lê todos os dados de uma aba como lista de dicts"""
-    try:
-        ws = spreadsheet.worksheet(sheet_name)
-    except gspread.WorksheetNotFound:
-        print(f"  [WARN] Aba '{sheet_name}' não encontrada, pulando...")
-        return []
+def parse_sheet_rows(sheet_name, all_values):
+    """Normaliza as linhas de uma aba em listas posicionais, lazily.
 
-    all_values = ws.get_all_values()
+    Cada linha sai com exatamente len(headers) células (pad/truncate),
+    na ordem de SHEET_COLUMNS — os consumidores desempacotam por
+    posição, sem montar (nem sondar) um dict por linha.
+    """
     if len(all_values) <= 1:
-        return []
+        return
 
     headers = SHEET_COLUMNS.get(sheet_name, all_values[0])
-    rows = []
+    header_len = len(headers)
     for row in all_values[1:]:
-        d = {}
-        for i, h in enumerate(headers):
-            d[h] = row[i] if i < len(row) else ''
-        rows.append(d)
-    return rows
+        pad = header_len - len(row)
+        if pad > 0:
+            yield row + [''] * pad
+        elif pad < 0:
+            yield row[:header_len]
+        else:
+            yield row
+
+
+def read_all_sheets(spreadsheet):
+    """
+    Lê as 4 abas em uma única chamada batchGet.
+
+    Um único round-trip HTTP (spreadsheets.values.batchGet) em vez de
+    quatro get_all_values sequenciais — relevante para dry-runs
+    repetidos sob o rate limit do Sheets.
+    """
+    ranges = [f'{name}!A:AC' for name in SHEET_COLUMNS]
+    # UNFORMATTED_VALUE: células numéricas chegam como int/float, sem
+    # parse str→int no cliente (score, contadores, attempt_number);
+    # datas continuam strings ISO para o safe_timestamp
+    resp = spreadsheet.values_batch_get(ranges, params={
+        'valueRenderOption': 'UNFORMATTED_VALUE',
+        'dateTimeRenderOption': 'FORMATTED_STRING',
+    })
+    value_ranges = resp.get('valueRanges', [])
+    return {
+        name: parse_sheet_rows(name, vr.get('values', []))
+        for name, vr in zip(SHEET_COLUMNS, value_ranges)
+    }
 
 
 def safe_int(val, default=0):
-    """Converte para int com fallback"""
-    try:
-        return int(val) if val else default
-    except (ValueError, TypeError):
+    """Converte para int com fallback.
+
+    Checagem LBYL em vez de try/except: célula ruim ('N/A', lixo, '')
+    é o caso comum em dado de planilha, e cada ValueError pagaria a
+    criação de traceback + unwind do frame.
+    """
+    if type(val) is int:
+        return val
+    if not val:
         return default
+    s = str(val).strip()
+    # isdecimal, não isdigit: isdigit aceita caracteres que int()
+    # rejeita (ex.: expoentes unicode como '¹')
+    digits = s[1:] if s[:1] in ('-', '+') else s
+    return int(s) if digits.isdecimal() else default
 
 
 def safe_timestamp(val):
@@ -101,174 +141,234 @@ def generate_id():
     return str(uuid.uuid4())[:8]
 
 
+# Escapes do formato text do COPY (uma passada C via translate)
+_COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+
+def _copy_field(val):
+    """Formata um valor para uma linha do COPY (\\N para NULL)"""
+    if val is None:
+        return '\\N'
+    return str(val).translate(_COPY_ESCAPES)
+
+
+def copy_rows(cur, table, columns, rows):
+    """
+    Carga em lote via COPY FROM STDIN.
+
+    COPY dispensa o parse por linha do INSERT, mas não aceita
+    ON CONFLICT; para manter a idempotência, os dados entram numa
+    staging temporária e um único INSERT ... SELECT ... ON CONFLICT
+    DO NOTHING move tudo para a tabela final.
+    """
+    buf = io.StringIO()
+    for row in rows:
+        buf.write('\t'.join(_copy_field(v) for v in row))
+        buf.write('\n')
+    buf.seek(0)
+
+    tmp = f'tmp_{table}'
+    cols = ', '.join(columns)
+    cur.execute(f"CREATE TEMP TABLE {tmp} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP")
+    cur.copy_expert(f"COPY {tmp} ({cols}) FROM STDIN WITH (FORMAT text, NULL '\\N')", buf)
+    cur.execute(f"INSERT INTO {table} ({cols}) SELECT {cols} FROM {tmp} ON CONFLICT DO NOTHING")
+
+
 def migrate_campaigns(cur, rows, dry_run=True):
     """Migra campanhas"""
     print(f"\n{'='*50}")
-    print(f"CAMPAIGNS: {len(rows)} registros")
+    print("CAMPAIGNS")
     print(f"{'='*50}")
 
     valid = []
     seen_ids = set()
-    for row in rows:
-        rid = row.get('id', '').strip()
+    # Bindings locais dos métodos quentes: resolve o atributo uma vez,
+    # não uma vez por linha
+    valid_append = valid.append
+    seen_ids_add = seen_ids.add
+    total = 0
+    for (rid, name, region, created_at, status,
+         total_leads, emails_sent, emails_failed) in rows:
+        total += 1
+        rid = str(rid).strip()
         if not rid or rid == 'id' or rid in seen_ids:
             old_id = rid
             rid = generate_id()
-            print(f"  [FIX] ID '{old_id}' → '{rid}' (campanha: {row.get('name', 'N/A')})")
-        seen_ids.add(rid)
+            print(f"  [FIX] ID '{old_id}' → '{rid}' (campanha: {name or 'N/A'})")
+        seen_ids_add(rid)
 
-        valid.append((
+        created_at = safe_timestamp(created_at)
+        valid_append((
             rid,
-            row.get('name', ''),
-            row.get('region', ''),
+            name,
+            region,
             '',  # description (novo)
-            safe_timestamp(row.get('created_at')),
-            safe_timestamp(row.get('created_at')),  # updated_at = created_at
-            row.get('status', 'pending') or 'pending',
-            safe_int(row.get('total_leads')),
-            safe_int(row.get('emails_sent')),
-            safe_int(row.get('emails_failed')),
+            created_at,
+            created_at,  # updated_at = created_at
+            status or 'pending',
+            safe_int(total_leads),
+            safe_int(emails_sent),
+            safe_int(emails_failed),
         ))
 
     if not dry_run and valid:
-        execute_values(cur, """
-            INSERT INTO campaigns (id, name, region, description, created_at, updated_at, status, total_leads, emails_sent, emails_failed)
-            VALUES %s
-            ON CONFLICT (id) DO NOTHING
-        """, valid)
+        copy_rows(cur, 'campaigns',
+                  ['id', 'name', 'region', 'description', 'created_at', 'updated_at',
+                   'status', 'total_leads', 'emails_sent', 'emails_failed'], valid)
 
-    print(f"  → {len(valid)} campanhas para inserir")
+    print(f"  → {len(valid)}/{total} campanhas para inserir")
     return {v[0]: v[1] for v in valid}  # id → name
 
 
 def migrate_leads(cur, rows, valid_campaign_ids, dry_run=True):
     """Migra leads"""
     print(f"\n{'='*50}")
-    print(f"LEADS: {len(rows)} registros")
+    print("LEADS")
     print(f"{'='*50}")
 
     valid = []
     orphan_count = 0
     seen_ids = set()
     id_map = {}  # old_id → new_id (para corrigir referências no email_log)
-
-    for row in rows:
-        rid = row.get('id', '').strip()
-        campaign_id = row.get('campaign_id', '').strip()
+    placeholder_campaigns = []  # escrita adiada: um único lote após o loop
+    placeholder_cache = {}  # campaign_id órfão -> id (evita re-rodar o SHA-1 do uuid5)
+    valid_append = valid.append
+    seen_ids_add = seen_ids.add
+
+    total = 0
+    for (rid, campaign_id, nome_clinica, endereco, cidade_uf, cnpj, site,
+         decisor_nome, decisor_cargo, decisor_linkedin, email_principal, email_tipo,
+         telefone, whatsapp, instagram, fonte, confianca, score,
+         resumo_clinica, perfil_decisor, gancho_personalizacao, dor_provavel, tom_sugerido,
+         raw, created_at) in rows:
+        total += 1
+        rid = str(rid).strip()
+        campaign_id = str(campaign_id).strip()
 
         # Fix ID
         original_id = rid
         if not rid or rid == 'id' or rid in seen_ids:
             rid = generate_id()
-            print(f"  [FIX] ID '{original_id}' → '{rid}' (lead: {row.get('nome_clinica', 'N/A')})")
+            print(f"  [FIX] ID '{original_id}' → '{rid}' (lead: {nome_clinica or 'N/A'})")
         if original_id and original_id != rid:
             id_map[original_id] = rid
-        seen_ids.add(rid)
+        seen_ids_add(rid)
 
         # Verifica FK campaign_id - cria campanha placeholder se necessário
         if campaign_id and campaign_id not in valid_campaign_ids:
             orphan_count += 1
-            placeholder_id = campaign_id if len(campaign_id) <= 8 else str(uuid.uuid5(uuid.NAMESPACE_DNS, campaign_id))[:8]
-            print(f"  [FIX] Criando campanha placeholder '{placeholder_id}' para lead '{row.get('nome_clinica')}'")
-            if not dry_run:
-                cur.execute("""
-                    INSERT INTO campaigns (id, name, region, description, created_at, updated_at, status, total_leads, emails_sent, emails_failed)
-                    VALUES (%s, %s, %s, %s, NOW(), NOW(), 'completed', 0, 0, 0)
-                    ON CONFLICT (id) DO NOTHING
-                """, (placeholder_id, f'[Migrada] {campaign_id}', '', f'Campanha criada automaticamente durante migracao para campaign_id={campaign_id}'))
+            placeholder_id = placeholder_cache.setdefault(
+                campaign_id,
+                campaign_id if len(campaign_id) <= 8 else str(uuid.uuid5(uuid.NAMESPACE_DNS, campaign_id))[:8]
+            )
+            print(f"  [FIX] Criando campanha placeholder '{placeholder_id}' para lead '{nome_clinica}'")
+            placeholder_campaigns.append((
+                placeholder_id, f'[Migrada] {campaign_id}', '',
+                f'Campanha criada automaticamente durante migracao para campaign_id={campaign_id}'
+            ))
             valid_campaign_ids.add(placeholder_id)
             campaign_id = placeholder_id
         elif not campaign_id:
             orphan_count += 1
-            print(f"  [WARN] Lead '{row.get('nome_clinica')}' sem campaign_id, pulando")
+            print(f"  [WARN] Lead '{nome_clinica}' sem campaign_id, pulando")
             continue
 
         # Score com validação
-        score = safe_int(row.get('score'))
-        score = max(0, min(100, score))
+        score = max(0, min(100, safe_int(score)))
 
         # Confiança com validação
-        confianca = row.get('confianca', '').strip()
-        if confianca not in ('', 'alta', 'media', 'baixa'):
+        confianca = str(confianca).strip()
+        if confianca not in VALID_CONFIANCA:
             confianca = ''
 
-        # raw_data como JSONB
-        raw = row.get('raw_data', '')
-        try:
-            raw_json = json.loads(raw) if raw else None
-        except (json.JSONDecodeError, TypeError):
-            raw_json = None
+        # raw_data vai como texto direto para o JSONB: o servidor valida e
+        # parseia uma vez (parser C), sem o round-trip json.loads→dumps
+        # por linha aqui. O guard barato filtra o que claramente não é JSON
+        raw_json_str = raw if isinstance(raw, str) and raw.lstrip().startswith(('{', '[')) else None
 
-        valid.append((
+        created_at = safe_timestamp(created_at)
+        valid_append((
             rid,
             campaign_id,
             'new',  # status (novo campo)
-            row.get('nome_clinica', ''),
-            row.get('endereco', ''),
-            row.get('cidade_uf', ''),
-            row.get('cnpj', ''),
-            row.get('site', ''),
-            row.get('decisor_nome', ''),
-            row.get('decisor_cargo', ''),
-            row.get('decisor_linkedin', ''),
-            row.get('email_principal', ''),
-            row.get('email_tipo', ''),
-            row.get('telefone', ''),
-            row.get('whatsapp', ''),
-            row.get('instagram', ''),
-            row.get('fonte', ''),
+            nome_clinica,
+            endereco,
+            cidade_uf,
+            cnpj,
+            site,
+            decisor_nome,
+            decisor_cargo,
+            decisor_linkedin,
+            email_principal,
+            email_tipo,
+            telefone,
+            whatsapp,
+            instagram,
+            fonte,
             confianca,
             score,
-            row.get('resumo_clinica', ''),
-            row.get('perfil_decisor', ''),
-            row.get('gancho_personalizacao', ''),
-            row.get('dor_provavel', ''),
-            row.get('tom_sugerido', ''),
+            resumo_clinica,
+            perfil_decisor,
+            gancho_personalizacao,
+            dor_provavel,
+            tom_sugerido,
             '',  # notas (novo)
             '',  # motivo_descarte (novo)
-            json.dumps(raw_json) if raw_json else None,
-            safe_timestamp(row.get('created_at')),
-            safe_timestamp(row.get('created_at')),  # updated_at = created_at
+            raw_json_str,
+            created_at,
+            created_at,  # updated_at = created_at
         ))
 
-    if not dry_run and valid:
+    # Placeholders antes dos leads (FK) — um round-trip para o lote todo
+    if not dry_run and placeholder_campaigns:
         execute_values(cur, """
-            INSERT INTO leads (
-                id, campaign_id, status, nome_clinica, endereco, cidade_uf, cnpj, site,
-                decisor_nome, decisor_cargo, decisor_linkedin, email_principal, email_tipo,
-                telefone, whatsapp, instagram, fonte, confianca, score,
-                resumo_clinica, perfil_decisor, gancho_personalizacao, dor_provavel, tom_sugerido,
-                notas, motivo_descarte, raw_data, created_at, updated_at
-            ) VALUES %s
+            INSERT INTO campaigns (id, name, region, description, created_at, updated_at, status, total_leads, emails_sent, emails_failed)
+            VALUES %s
             ON CONFLICT (id) DO NOTHING
-        """, valid)
+        """, placeholder_campaigns, page_size=1000,
+            template="(%s, %s, %s, %s, NOW(), NOW(), 'completed', 0, 0, 0)")
 
-    print(f"  → {len(valid)} leads para inserir, {orphan_count} órfãos ignorados")
+    if not dry_run and valid:
+        copy_rows(cur, 'leads',
+                  ['id', 'campaign_id', 'status', 'nome_clinica', 'endereco', 'cidade_uf', 'cnpj', 'site',
+                   'decisor_nome', 'decisor_cargo', 'decisor_linkedin', 'email_principal', 'email_tipo',
+                   'telefone', 'whatsapp', 'instagram', 'fonte', 'confianca', 'score',
+                   'resumo_clinica', 'perfil_decisor', 'gancho_personalizacao', 'dor_provavel', 'tom_sugerido',
+                   'notas', 'motivo_descarte', 'raw_data', 'created_at', 'updated_at'], valid)
+
+    print(f"  → {len(valid)}/{total} leads para inserir, {orphan_count} órfãos ignorados")
     return {v[0] for v in valid}, id_map  # set de IDs válidos
 
 
 def migrate_email_log(cur, rows, valid_lead_ids, valid_campaign_ids, lead_id_map, dry_run=True):
     """Migra email_log"""
     print(f"\n{'='*50}")
-    print(f"EMAIL_LOG: {len(rows)} registros")
+    print("EMAIL_LOG")
     print(f"{'='*50}")
 
     valid = []
     orphan_leads = 0
     orphan_campaigns = 0
     seen_ids = set()
-
-    for row in rows:
-        rid = row.get('id', '').strip()
-        lead_id = row.get('lead_id', '').strip()
-        campaign_id = row.get('campaign_id', '').strip()
+    placeholder_campaigns = []  # escrita adiada: um único lote após o loop
+    placeholder_cache = {}  # campaign_id órfão -> id (evita re-rodar o SHA-1 do uuid5)
+    valid_append = valid.append
+    seen_ids_add = seen_ids.add
+
+    total = 0
+    for (rid, lead_id, campaign_id, email_to, subject, status,
+         attempt_number, resend_id, error_message, sent_at, created_at) in rows:
+        total += 1
+        rid = str(rid).strip()
+        lead_id = str(lead_id).strip()
+        campaign_id = str(campaign_id).strip()
 
         # Fix ID
         if not rid or rid == 'id' or rid in seen_ids:
             old = rid
             rid = generate_id()
             print(f"  [FIX] ID '{old}' → '{rid}'")
-        seen_ids.add(rid)
+        seen_ids_add(rid)
 
         # Corrige lead_id usando mapa
         if lead_id in lead_id_map:
@@ -282,100 +382,102 @@ def migrate_email_log(cur, rows, valid_lead_ids, valid_campaign_ids, lead_id_map
 
         if campaign_id and campaign_id not in valid_campaign_ids:
             # Cria campanha placeholder
-            placeholder_id = campaign_id if len(campaign_id) <= 8 else str(uuid.uuid5(uuid.NAMESPACE_DNS, campaign_id))[:8]
-            if not dry_run:
-                cur.execute("""
-                    INSERT INTO campaigns (id, name, region, description, created_at, updated_at, status, total_leads, emails_sent, emails_failed)
-                    VALUES (%s, %s, '', %s, NOW(), NOW(), 'completed', 0, 0, 0)
-                    ON CONFLICT (id) DO NOTHING
-                """, (placeholder_id, f'[Migrada] {campaign_id}', f'Campanha criada para email_log com campaign_id={campaign_id}'))
+            placeholder_id = placeholder_cache.setdefault(
+                campaign_id,
+                campaign_id if len(campaign_id) <= 8 else str(uuid.uuid5(uuid.NAMESPACE_DNS, campaign_id))[:8]
+            )
+            placeholder_campaigns.append((
+                placeholder_id, f'[Migrada] {campaign_id}', '',
+                f'Campanha criada para email_log com campaign_id={campaign_id}'
+            ))
             valid_campaign_ids.add(placeholder_id)
             campaign_id = placeholder_id
             orphan_campaigns += 1
 
         # Status com validação
-        status = row.get('status', 'pending').strip()
-        if status not in ('pending', 'sent', 'failed', 'bounced', 'rejected'):
+        status = str(status).strip()
+        if status not in VALID_EMAIL_STATUS:
             status = 'pending'
 
-        valid.append((
+        valid_append((
             rid,
             lead_id or None,
             campaign_id or None,
-            row.get('email_to', ''),
-            row.get('subject', ''),
+            email_to,
+            subject,
             '',  # body_html (novo, não existia antes)
             status,
-            safe_int(row.get('attempt_number'), 1),
-            row.get('resend_id', ''),
-            row.get('error_message', ''),
-            safe_timestamp(row.get('sent_at')),
-            safe_timestamp(row.get('created_at')),
+            safe_int(attempt_number, 1),
+            resend_id,
+            error_message,
+            safe_timestamp(sent_at),
+            safe_timestamp(created_at),
         ))
 
-    if not dry_run and valid:
+    # Placeholders antes do email_log (FK) — um round-trip para o lote todo
+    if not dry_run and placeholder_campaigns:
         execute_values(cur, """
-            INSERT INTO email_log (
-                id, lead_id, campaign_id, email_to, subject, body_html, status,
-                attempt_number, resend_id, error_message, sent_at, created_at
-            ) VALUES %s
+            INSERT INTO campaigns (id, name, region, description, created_at, updated_at, status, total_leads, emails_sent, emails_failed)
+            VALUES %s
             ON CONFLICT (id) DO NOTHING
-        """, valid)
+        """, placeholder_campaigns, page_size=1000,
+            template="(%s, %s, %s, %s, NOW(), NOW(), 'completed', 0, 0, 0)")
+
+    if not dry_run and valid:
+        copy_rows(cur, 'email_log',
+                  ['id', 'lead_id', 'campaign_id', 'email_to', 'subject', 'body_html', 'status',
+                   'attempt_number', 'resend_id', 'error_message', 'sent_at', 'created_at'], valid)
 
-    print(f"  → {len(valid)} emails para inserir")
+    print(f"  → {len(valid)}/{total} emails para inserir")
     if orphan_leads > 0:
         print(f"  → {orphan_leads} com lead_id órfão (SET NULL)")
     if orphan_campaigns > 0:
         print(f"  → {orphan_campaigns} com campaign_id órfão (SET NULL)")
 
 
+def _fixed_id(rid, seen_ids):
+    """Normaliza um id de planilha, gerando um novo se vazio/corrompido/duplicado"""
+    rid = str(rid).strip()
+    if not rid or rid == 'id' or rid in seen_ids:
+        rid = generate_id()
+    seen_ids.add(rid)
+    return rid
+
+
 def migrate_blacklist(cur, rows, dry_run=True):
     """Migra blacklist"""
     print(f"\n{'='*50}")
-    print(f"BLACKLIST: {len(rows)} registros")
+    print("BLACKLIST")
     print(f"{'='*50}")
 
-    valid = []
-    seen_emails = set()
-    seen_ids = set()
-
-    for row in rows:
-        rid = row.get('id', '').strip()
-        email = row.get('email', '').strip().lower()
-
-        if not email:
-            continue
-
-        if email in seen_emails:
-            print(f"  [SKIP] Email duplicado: {email}")
-            continue
-        seen_emails.add(email)
-
-        if not rid or rid == 'id' or rid in seen_ids:
-            rid = generate_id()
-        seen_ids.add(rid)
-
-        # Valida reason
-        reason = row.get('reason', 'user_request').strip()
-        if reason not in ('user_request', 'hard_bounce', 'spam_complaint', 'manual', 'invalid_email'):
-            reason = 'user_request'
+    # Dedup por email em uma passada: um único probe de hash por linha
+    # (insert-if-absent no dict, primeira ocorrência vence), em vez de
+    # set de vistos + append separados
+    unique = {}
+    total = 0
+    for rid, email, reason, added_at in rows:
+        total += 1
+        email = str(email).strip().lower()
+        if email and email not in unique:
+            unique[email] = (rid, str(reason).strip(), added_at)
 
-        valid.append((
-            rid,
+    seen_ids = set()
+    valid = [
+        (
+            _fixed_id(rid, seen_ids),
             email,
-            reason,
+            reason if reason in VALID_BLACKLIST_REASON else 'user_request',
             None,  # source_campaign_id (não existia antes)
-            safe_timestamp(row.get('added_at')),
-        ))
+            safe_timestamp(added_at),
+        )
+        for email, (rid, reason, added_at) in unique.items()
+    ]
 
     if not dry_run and valid:
-        execute_values(cur, """
-            INSERT INTO blacklist (id, email, reason, source_campaign_id, added_at)
-            VALUES %s
-            ON CONFLICT (email) DO NOTHING
-        """, valid)
+        copy_rows(cur, 'blacklist',
+                  ['id', 'email', 'reason', 'source_campaign_id', 'added_at'], valid)
 
-    print(f"  → {len(valid)} emails para inserir")
+    print(f"  → {len(valid)}/{total} emails para inserir ({total - len(valid)} duplicados/vazios ignorados)")
 
 
 def update_lead_statuses(cur, dry_run=True):
@@ -385,19 +487,32 @@ def update_lead_statuses(cur, dry_run=True):
     print(f"{'='*50}")
 
     if not dry_run:
+        # Índice parcial: o DISTINCT vira index-only scan
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS idx_email_log_sent
+            ON email_log (lead_id) WHERE status = 'sent'
+        """)
+        # UPDATE ... FROM em vez de IN (subquery); o predicado de status
+        # torna o comando idempotente e poupa WAL em linhas já corretas
         cur.execute("""
             UPDATE leads SET status = 'contacted', updated_at = NOW()
-            WHERE id IN (
+            FROM (
                 SELECT DISTINCT lead_id FROM email_log
                 WHERE status = 'sent' AND lead_id IS NOT NULL
-            )
+            ) s
+            WHERE leads.id = s.lead_id AND leads.status <> 'contacted'
         """)
         count = cur.rowcount
         print(f"  → {count} leads atualizados para 'contacted'")
     else:
+        # COUNT sobre subquery DISTINCT em vez de COUNT(DISTINCT ...):
+        # o planner resolve o DISTINCT por index-only scan no índice
+        # parcial idx_email_log_sent quando ele existe, sem sort
         cur.execute("""
-            SELECT COUNT(DISTINCT lead_id) FROM email_log
-            WHERE status = 'sent' AND lead_id IS NOT NULL
+            SELECT COUNT(*) FROM (
+                SELECT DISTINCT lead_id FROM email_log
+                WHERE status = 'sent' AND lead_id IS NOT NULL
+            ) s
         """)
         count = cur.fetchone()[0]
         print(f"  → {count} leads seriam atualizados para 'contacted'")
@@ -415,42 +530,56 @@ def main():
         print("  EXECUTANDO MIGRAÇÃO REAL")
         print("=" * 60)
 
-    # 1. Conectar
-    print("\n[1/7] Conectando ao Google Sheets...")
-    spreadsheet = connect_sheets()
-    print("  OK")
-
-    print("[2/7] Conectando ao Neon PostgreSQL...")
-    conn = connect_sql()
+    # 1. Conectar — os dois handshakes (OAuth do Sheets e TLS do Neon)
+    # são I/O independentes; em paralelo o custo é o do mais lento
+    print("\n[1-2/7] Conectando ao Google Sheets e ao Neon PostgreSQL...")
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        sheets_future = pool.submit(connect_sheets)
+        sql_future = pool.submit(connect_sql)
+        spreadsheet = sheets_future.result()
+        conn = sql_future.result()
     conn.autocommit = False
     cur = conn.cursor()
+    # Tuning da sessão de carga (SET, não SET LOCAL: precisa sobreviver
+    # aos commits por tabela): sem fsync por commit e mais memória para
+    # os sorts/DISTINCT do pós-processamento
+    cur.execute("SET synchronous_commit = off")
+    cur.execute("SET work_mem = '256MB'")
     print("  OK")
 
     try:
         # 2. Ler dados do Sheets
         print("\n[3/7] Lendo dados do Google Sheets...")
-        campaigns_data = read_sheet(spreadsheet, 'campaigns')
-        leads_data = read_sheet(spreadsheet, 'leads')
-        email_log_data = read_sheet(spreadsheet, 'email_log')
-        blacklist_data = read_sheet(spreadsheet, 'blacklist')
-
-        print(f"  Campaigns: {len(campaigns_data)}")
-        print(f"  Leads: {len(leads_data)}")
-        print(f"  Email Log: {len(email_log_data)}")
-        print(f"  Blacklist: {len(blacklist_data)}")
+        sheets = read_all_sheets(spreadsheet)
+        campaigns_data = sheets['campaigns']
+        leads_data = sheets['leads']
+        email_log_data = sheets['email_log']
+        blacklist_data = sheets['blacklist']
+
+        # 3. Migrar na ordem correta. Em --execute, um commit por tabela:
+        # uma queda no meio do email_log não perde campanhas/leads já
+        # carregados, e re-rodar retoma de onde parou — as cargas são
+        # ON CONFLICT DO NOTHING, então o próprio banco é o checkpoint
+        # (nada de arquivo de estado local para manter em sincronia)
+        def checkpoint():
+            if not dry_run:
+                conn.commit()
 
-        # 3. Migrar na ordem correta
         print("\n[4/7] Migrando campanhas...")
         campaign_ids = migrate_campaigns(cur, campaigns_data, dry_run)
+        checkpoint()
 
         print("\n[5/7] Migrando leads...")
         lead_ids, lead_id_map = migrate_leads(cur, leads_data, set(campaign_ids.keys()), dry_run)
+        checkpoint()
 
         print("\n[6/7] Migrando email_log...")
         migrate_email_log(cur, email_log_data, lead_ids, set(campaign_ids.keys()), lead_id_map, dry_run)
+        checkpoint()
 
         print("\n[7/7] Migrando blacklist...")
         migrate_blacklist(cur, blacklist_data, dry_run)
+        checkpoint()
 
         # 4. Atualizar status dos leads
         update_lead_statuses(cur, dry_run)
@@ -14,7 +14,7 @@ from pathlib import Path
 # Adiciona o diretório raiz ao path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from app.database import get_worksheet, SHEET_COLUMNS
+from app.database import get_cursor
 
 
 def test_lead_processing_logic():
@@ -46,10 +46,15 @@ def test_lead_processing_logic():
     discarded_leads = []
     processed_names = set()
 
+    # Índice nome -> lead construído uma vez: lookup O(1) nos dois loops
+    # abaixo, em vez de um scan linear por nome (e determinístico para
+    # nomes duplicados — o último vence, explícito)
+    leads_by_name = {l.get('nome_clinica'): l for l in leads}
+
     # 1. Processa leads_processados
     for proc_lead in llm_result.get('leads_processados', []):
         nome = proc_lead.get('nome_clinica')
-        original = next((l for l in leads if l.get('nome_clinica') == nome), None)
+        original = leads_by_name.get(nome)
         if original:
             processed_names.add(nome)
             original['score'] = proc_lead.get('score', 50)
@@ -65,7 +70,7 @@ def test_lead_processing_logic():
     for disc_lead in llm_result.get('leads_descartados', []):
         nome = disc_lead.get('nome_clinica')
         if nome not in processed_names:
-            original = next((l for l in leads if l.get('nome_clinica') == nome), None)
+            original = leads_by_name.get(nome)
             if original:
                 processed_names.add(nome)
                 original['discard_reason'] = disc_lead.get('motivo', 'Descartado')
@@ -122,32 +127,32 @@ def check_database_leads():
     print("=" * 60)
 
     try:
-        ws = get_worksheet('leads')
-        all_rows = ws.get_all_values()
-
-        if len(all_rows) <= 1:
+        with get_cursor() as cur:
+            cur.execute("""
+                SELECT COUNT(*) AS total,
+                       COUNT(*) FILTER (WHERE email_principal != '') AS with_email
+                FROM leads
+            """)
+            counts = cur.fetchone()
+
+            cur.execute("""
+                SELECT nome_clinica, email_principal
+                FROM leads ORDER BY created_at DESC LIMIT 5
+            """)
+            recent = cur.fetchall()
+
+        if not counts['total']:
             print("⚠️  Nenhum lead encontrado no banco")
             return
 
-        headers = all_rows[0]
-        leads_count = len(all_rows) - 1
-
-        print(f"\nTotal de leads no banco: {leads_count}")
-
-        # Conta leads com e sem email
-        email_col = headers.index('email_principal') if 'email_principal' in headers else -1
-        if email_col >= 0:
-            with_email = sum(1 for row in all_rows[1:] if len(row) > email_col and row[email_col])
-            without_email = leads_count - with_email
-            print(f"  • Com email: {with_email}")
-            print(f"  • Sem email: {without_email}")
+        print(f"\nTotal de leads no banco: {counts['total']}")
+        print(f"  • Com email: {counts['with_email']}")
+        print(f"  • Sem email: {counts['total'] - counts['with_email']}")
 
         # Mostra últimos 5 leads
         print("\n--- Últimos 5 leads ---")
-        for row in all_rows[-5:]:
-            nome = row[2] if len(row) > 2 else 'N/A'
-            email = row[10] if len(row) > 10 else 'N/A'
-            print(f"  • {nome} | {email or '(sem email)'}")
+        for row in recent:
+            print(f"  • {row['nome_clinica']} | {row['email_principal'] or '(sem email)'}")
 
     except Exception as e:
         print(f"❌ Erro ao verificar banco: {e}")
@@ -160,27 +165,21 @@ def check_email_log():
     print("=" * 60)
 
     try:
-        ws = get_worksheet('email_log')
-        all_rows = ws.get_all_values()
+        with get_cursor() as cur:
+            cur.execute("SELECT status, COUNT(*) AS n FROM email_log GROUP BY status")
+            by_status = {row['status']: row['n'] for row in cur.fetchall()}
 
-        if len(all_rows) <= 1:
+        emails_count = sum(by_status.values())
+        if not emails_count:
             print("⚠️  Nenhum email log encontrado")
             return
 
-        headers = all_rows[0]
-        emails_count = len(all_rows) - 1
-
         print(f"\nTotal de emails no log: {emails_count}")
-
-        # Conta por status
-        status_col = headers.index('status') if 'status' in headers else -1
-        if status_col >= 0:
-            sent = sum(1 for row in all_rows[1:] if len(row) > status_col and row[status_col] == 'sent')
-            failed = sum(1 for row in all_rows[1:] if len(row) > status_col and row[status_col] == 'failed')
-            pending = emails_count - sent - failed
-            print(f"  • Enviados: {sent}")
-            print(f"  • Falharam: {failed}")
-            print(f"  • Pendentes: {pending}")
+        sent = by_status.get('sent', 0)
+        failed = by_status.get('failed', 0)
+        print(f"  • Enviados: {sent}")
+        print(f"  • Falharam: {failed}")
+        print(f"  • Pendentes: {emails_count - sent - failed}")
 
     except Exception as e:
         print(f"❌ Erro ao verificar email_log: {e}")